@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the LARP Character Assignment Tool.
+Run with: python benchmark.py
+Run the solver suite and write JSON with: python benchmark.py --suite --json results.json
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from dependencies import numpy as np, scipy_csgraph, scipy_optimize
+from main import LARPAssigner
+from solvers import solve_shortest_augmenting_path
+
+
+def random_assigner(num_players: int, seed: int = 0) -> LARPAssigner:
+    """Build an assigner where every player ranks the cast uniformly at random."""
+    rng = random.Random(seed)
+    characters = [f"Character {i + 1}" for i in range(num_players)]
+    assigner = LARPAssigner(num_players)
+    for i in range(num_players):
+        ranking = characters.copy()
+        rng.shuffle(ranking)
+        assigner.add_player_preferences(f"Player {i + 1}", ranking)
+    return assigner
+
+
+def uniform_rankings(
+        num_players: int, num_characters: int, seed: int = 0
+) -> "np.ndarray":
+    """
+    Every player ranks the cast uniformly at random.
+
+    Returns:
+        Array of shape (players, characters); row i lists player i's
+        character indices from first to last choice
+    """
+    rng = np.random.default_rng(seed)
+    rankings = np.tile(np.arange(num_characters), (num_players, 1))
+    return rng.permuted(rankings, axis=1)
+
+
+def mallows_rankings(
+        num_players: int, num_characters: int, phi: float = 0.8, seed: int = 0
+) -> "np.ndarray":
+    """
+    Rankings drawn from a Mallows model around the consensus order
+    0, 1, 2, ...: the probability of a ranking falls by a factor phi for
+    every pair it orders differently from the consensus (phi = 1 is uniform,
+    small phi means near-unanimous players). Sampled exactly with the
+    repeated insertion model.
+
+    Returns:
+        Array as for uniform_rankings
+    """
+    rng = np.random.default_rng(seed)
+    rankings = np.empty((num_players, num_characters), dtype=np.intp)
+    # Character i goes d places above the end of the first i characters,
+    # with P(d) proportional to phi ** d for d = 0..i (inverse CDF)
+    sizes = np.arange(1, num_characters + 1)
+    for player in range(num_players):
+        if phi >= 1:
+            displacements = np.floor(rng.random(num_characters) * sizes)
+        else:
+            mass = 1 - phi ** sizes
+            displacements = np.floor(
+                np.log1p(-rng.random(num_characters) * mass) / np.log(phi)
+            )
+        positions = sizes - 1 - np.minimum(displacements, sizes - 1)
+        order: List[int] = []
+        for character, position in enumerate(positions.astype(int).tolist()):
+            order.insert(position, character)
+        rankings[player] = order
+    return rankings
+
+
+def popularity_rankings(
+        num_players: int, num_characters: int, skew: float = 1.5, seed: int = 0
+) -> "np.ndarray":
+    """
+    Rankings with heavy popularity skew: character j has weight
+    1 / (j + 1) ** skew and each player ranks by drawing characters without
+    replacement in proportion to weight (Plackett-Luce, sampled by sorting
+    log weights plus Gumbel noise). A few stars are everyone's top picks.
+
+    Returns:
+        Array as for uniform_rankings
+    """
+    rng = np.random.default_rng(seed)
+    log_weights = -skew * np.log1p(np.arange(num_characters))
+    keys = log_weights + rng.gumbel(size=(num_players, num_characters))
+    return np.argsort(-keys, axis=1)
+
+
+GENERATORS: Dict[str, Callable[..., "np.ndarray"]] = {
+    "uniform": uniform_rankings,
+    "mallows": mallows_rankings,
+    "popularity": popularity_rankings,
+}
+
+
+def assigner_from_rankings(rankings: "np.ndarray") -> LARPAssigner:
+    """Build an assigner from a generator's rankings array."""
+    num_players, num_characters = rankings.shape
+    characters = [f"Character {j + 1}" for j in range(num_characters)]
+    assigner = LARPAssigner(num_characters, characters)
+    # Row i of the rank array holds the rank player i gives each character
+    assigner.add_players(
+        np.argsort(rankings, axis=1) + 1,
+        [f"Player {i + 1}" for i in range(num_players)],
+    )
+    return assigner
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall time of several calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_hungarian_engines(
+        sizes: Sequence[int] = (10, 25, 50, 100, 200, 400)
+) -> List[Dict[str, float]]:
+    """
+    Compare the built-in shortest augmenting path solver with scipy's
+    linear_sum_assignment on the same linear points matrices.
+
+    Returns:
+        One dict per cast size with the timings in seconds
+        (scipy is None when scipy is not installed)
+    """
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        linear_sum_assignment = None
+
+    results = []
+    for size in sizes:
+        _, _, matrix = random_assigner(size).generate_assignment_matrix()
+        rows = matrix.tolist()
+
+        builtin = best_time(lambda: solve_shortest_augmenting_path(rows))
+        scipy = None
+        if linear_sum_assignment is not None:
+            scipy = best_time(lambda: linear_sum_assignment(-matrix))
+
+        results.append({"size": size, "builtin": builtin, "scipy": scipy})
+    return results
+
+
+# Solvers timed by benchmark_suite(): name -> (call, largest cast size it is
+# run on, None = no limit). Exponential-time solvers stop early.
+SUITE_SOLVERS: Dict[str, tuple] = {
+    "hungarian (scipy)": (
+        lambda a: a.solve_assignment_hungarian(engine="scipy"), None),
+    "hungarian (builtin)": (
+        lambda a: a.solve_assignment_hungarian(engine="builtin"), 500),
+    "sparse": (lambda a: a.solve_assignment_sparse(), None),
+    "min cost flow": (lambda a: a.solve_assignment_min_cost_flow(), 1000),
+    "bottleneck": (lambda a: a.solve_assignment_bottleneck(), None),
+    "rank maximal": (lambda a: a.solve_assignment_rank_maximal(), None),
+    "k best (k=5)": (
+        lambda a: list(a.solve_assignment_k_best(k=5)), 200),
+    "branch and bound": (lambda a: a.solve_assignment_branch_and_bound(), 50),
+    "dp": (lambda a: a.solve_assignment_dp(), 15),
+    "brute force": (lambda a: a.solve_assignment_brute_force(), 8),
+}
+
+
+def benchmark_suite(
+        sizes: Sequence[int] = (5, 50, 500, 5000),
+        generators: Sequence[str] = tuple(GENERATORS),
+        repeat: int = 3,
+        progress: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> List[Dict[str, object]]:
+    """
+    Time the hot paths on synthetic casts of n players and n characters:
+    building the rank and points matrices (from a cold cache), every solver
+    in SUITE_SOLVERS up to its size limit, and print_results, plus branch
+    and bound on a 20-player consensus cast with weighted scoring. Solvers
+    run on a warm matrix cache, so their timings exclude the matrix build.
+
+    Args:
+        sizes: Cast sizes n
+        generators: Names from GENERATORS
+        repeat: Timings are the best of this many runs (once for n > 500)
+        progress: Called with each result as it is measured
+
+    Returns:
+        One dict per (generator, size, phase) with the time in seconds
+    """
+    results = []
+    # Import scipy up front so the first timing does not include it
+    if scipy_optimize.is_available():
+        scipy_optimize.linear_sum_assignment
+        scipy_csgraph.min_weight_full_bipartite_matching
+
+    def record(generator: str, size: int, phase: str, seconds: float) -> None:
+        result = {"generator": generator, "size": size, "phase": phase,
+                  "seconds": seconds}
+        results.append(result)
+        if progress is not None:
+            progress(result)
+
+    for generator, size in itertools.product(generators, sizes):
+        runs = repeat if size <= 500 else 1
+        start = time.perf_counter()
+        rankings = GENERATORS[generator](size, size)
+        record(generator, size, "generate preferences",
+               time.perf_counter() - start)
+        start = time.perf_counter()
+        assigner = assigner_from_rankings(rankings)
+        record(generator, size, "add_players", time.perf_counter() - start)
+
+        def cold_matrix():
+            assigner.clear_cache()
+            assigner.generate_assignment_matrix()
+
+        record(generator, size, "generate_assignment_matrix",
+               best_time(cold_matrix, runs))
+
+        for name, (solve, max_size) in SUITE_SOLVERS.items():
+            if max_size is not None and size > max_size:
+                continue
+            if name == "hungarian (scipy)" and not scipy_optimize.is_available():
+                continue
+            record(generator, size, name,
+                   best_time(lambda: solve(assigner), runs))
+
+        if size <= 1000:
+            # Warm-started re-solve after one player changes their ranking
+            player = next(iter(assigner.players))
+            ranking = assigner.players[player]
+            rankings = itertools.cycle([ranking[::-1], ranking])
+            assigner.solve_assignment_incremental()
+
+            def resubmit():
+                assigner.add_player_preferences(player, next(rankings))
+                assigner.solve_assignment_incremental()
+
+            record(generator, size, "incremental (one change)",
+                   best_time(resubmit, runs))
+            assigner.add_player_preferences(player, ranking)
+
+        assignments, score, details = assigner.solve_assignment_hungarian()
+        record(generator, size, "print_results", best_time(
+            lambda: assigner.print_results(assignments, score, details,
+                                           file=io.StringIO()),
+            runs,
+        ))
+
+    if "mallows" in generators:
+        # Near-unanimous players with a steep scoring system tie most cells,
+        # the hard case for search-based solvers
+        assigner = assigner_from_rankings(mallows_rankings(20, 20, phi=0.3))
+        assigner.generate_assignment_matrix("weighted")
+        record("mallows (phi=0.3)", 20, "branch and bound (weighted)",
+               best_time(lambda: assigner.solve_assignment_branch_and_bound(
+                   "weighted"), repeat))
+    return results
+
+
+def environment() -> Dict[str, object]:
+    """Versions recorded alongside the suite results."""
+    info = {"python": platform.python_version(), "platform": platform.platform()}
+    for name, module in (("numpy", np), ("scipy", scipy_optimize)):
+        if module.is_available():
+            info[name] = __import__(name).__version__
+    return info
+
+
+# Entry paths timed by benchmark_startup(); PATH is a preferences JSON file
+STARTUP_PATHS = {
+    "import": "import main",
+    "load_from_json": (
+        "from main import load_from_json\n"
+        "load_from_json(PATH)"
+    ),
+    "validate and report": (
+        "from main import load_from_json\n"
+        "assigner = load_from_json(PATH)\n"
+        "assignments = dict(zip(assigner.players, assigner.characters))\n"
+        "details = [(p, c, 0, assigner.players[p].index(c) + 1)\n"
+        "           for p, c in assignments.items()]\n"
+        "assigner.check_satisfaction_constraints(assignments, 3)\n"
+        "assigner.print_results(assignments, 0, details)"
+    ),
+    "solve (builtin)": (
+        "from main import load_from_json\n"
+        "load_from_json(PATH).solve_assignment_hungarian(engine='builtin')"
+    ),
+    "solve (scipy)": (
+        "from main import load_from_json\n"
+        "load_from_json(PATH).solve_assignment_hungarian(engine='scipy')"
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, object]:
+    """
+    Summarize `python -X importtime` output.
+
+    Returns:
+        Dict with the total import time in seconds and whether numpy and
+        scipy were imported
+    """
+    total_us = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append(name.strip())
+        if not name[1:].startswith(" "):  # top-level import
+            total_us += int(cumulative)
+    return {
+        "import_time": total_us / 1e6,
+        "numpy": any(m.split(".")[0] == "numpy" for m in modules),
+        "scipy": any(m.split(".")[0] == "scipy" for m in modules),
+    }
+
+
+def benchmark_startup(num_players: int = 5) -> List[Dict[str, object]]:
+    """
+    Time a fresh interpreter for each entry path in STARTUP_PATHS, using
+    `python -X importtime` to record what each one imports.
+
+    Returns:
+        One dict per entry path with its wall time and import summary
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    assigner = random_assigner(num_players)
+    data = {"characters": assigner.characters, "players": dict(assigner.players)}
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "preferences.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+        for name, code in STARTUP_PATHS.items():
+            code = f"PATH = {path!r}\n{code}"
+            # Run once untimed so every path starts from compiled bytecode
+            subprocess.run([sys.executable, "-c", code], cwd=here,
+                           capture_output=True)
+            start = time.perf_counter()
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", code],
+                cwd=here, capture_output=True, text=True,
+            )
+            wall_time = time.perf_counter() - start
+
+            result = {"path": name, "ok": process.returncode == 0,
+                      "wall_time": wall_time}
+            result.update(parse_importtime(process.stderr))
+            results.append(result)
+    return results
+
+
+def main():
+    """Run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--suite", action="store_true",
+                        help="run the solver suite on synthetic casts")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[5, 50, 500, 5000], help="suite cast sizes")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS),
+                        default=list(GENERATORS), help="suite generators")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="suite runs per timing (best is kept)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="write the suite results to PATH as JSON")
+    args = parser.parse_args()
+
+    if args.suite:
+        print(f"{'Generator':<18} {'Players':<8} {'Phase':<28} {'Seconds':<10}")
+        print("-" * 60)
+        results = benchmark_suite(
+            args.sizes, args.generators, args.repeat,
+            progress=lambda r: print(
+                f"{r['generator']:<18} {r['size']:<8} {r['phase']:<28} "
+                f"{r['seconds']:<10.5f}", flush=True,
+            ),
+        )
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"environment": environment(), "results": results},
+                          f, indent=2)
+        return
+
+    print("Start-up per entry path (seconds):")
+    print(f"{'Entry path':<22} {'Wall':<8} {'Imports':<8} {'numpy':<6} {'scipy':<6}")
+    print("-" * 54)
+    for result in benchmark_startup():
+        if not result["ok"]:
+            print(f"{result['path']:<22} failed")
+            continue
+        print(f"{result['path']:<22} {result['wall_time']:<8.3f} "
+              f"{result['import_time']:<8.3f} "
+              f"{'yes' if result['numpy'] else 'no':<6} "
+              f"{'yes' if result['scipy'] else 'no':<6}")
+
+    print("\nHungarian engines (seconds, best of 3):")
+    print(f"{'Players':<10} {'Built-in':<12} {'scipy':<12}")
+    print("-" * 34)
+    for result in benchmark_hungarian_engines():
+        scipy = "n/a" if result["scipy"] is None else f"{result['scipy']:.5f}"
+        print(f"{result['size']:<10} {result['builtin']:<12.5f} {scipy:<12}")
+
+
+if __name__ == "__main__":
+    main()
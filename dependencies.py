@@ -0,0 +1,69 @@
+"""
+Lazy access to the heavy third-party dependencies.
+
+Importing numpy takes ~0.1s and scipy.optimize ~0.5s, which dominates the
+start-up of short jobs that only load, validate or report preferences.
+The modules below are imported on first attribute access and cached, so
+only the code paths that actually solve pay for them.
+"""
+
+import importlib
+import importlib.util
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str, install_hint: str):
+        """
+        Args:
+            name: Dotted module name
+            install_hint: Shown in the ImportError if the module is missing
+        """
+        self._name = name
+        self._install_hint = install_hint
+        self._module = None
+
+    def _import(self):
+        """Import the module (once) and return it."""
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError:
+                raise ImportError(
+                    f"{self._name} is required for this operation. "
+                    f"Install with: {self._install_hint}"
+                )
+        return self._module
+
+    def is_available(self) -> bool:
+        """Whether the module can be imported, without importing it."""
+        if self._module is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self._name) is not None
+        except ImportError:
+            return False
+
+    def is_loaded(self) -> bool:
+        """Whether the module has been imported through this stand-in."""
+        return self._module is not None
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes not found on the stand-in itself, so
+        # caching the module's attribute here makes later lookups direct
+        if attribute.startswith("_"):
+            raise AttributeError(attribute)
+        value = getattr(self._import(), attribute)
+        setattr(self, attribute, value)
+        return value
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+numpy = LazyModule("numpy", "pip install numpy")
+scipy_optimize = LazyModule("scipy.optimize", "pip install scipy")
+scipy_sparse = LazyModule("scipy.sparse", "pip install scipy")
+scipy_csgraph = LazyModule("scipy.sparse.csgraph", "pip install scipy")
@@ -0,0 +1,139 @@
+"""
+Opt-in timing and call counters for the LARP Character Assignment Tool.
+
+LARPAssigner.enable_instrumentation() wraps the assigner's own methods with
+the recorders below, on that instance only. Nothing is wrapped by default,
+so an assigner that never enables instrumentation runs exactly the same
+code as before.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class PhaseStats:
+    """Totals for one named phase."""
+
+    __slots__ = ("calls", "wall_time", "cpu_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    def __repr__(self) -> str:
+        return (f"PhaseStats(calls={self.calls}, wall_time={self.wall_time:.6f}, "
+                f"cpu_time={self.cpu_time:.6f})")
+
+
+class Stats:
+    """
+    Wall and CPU time per phase, call counters, and the individual phase
+    runs for export as Chrome trace events (chrome://tracing, Perfetto).
+    Phase times are inclusive: a solver's time contains the matrix build it
+    triggers, and the trace shows the nesting.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one run of the named phase."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            totals = self.phases.get(name)
+            if totals is None:
+                totals = self.phases[name] = PhaseStats()
+            totals.calls += 1
+            totals.wall_time += wall
+            totals.cpu_time += cpu
+            self._events.append({
+                "name": name, "ph": "X", "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "ts": (wall_start - self._origin) * 1e6, "dur": wall * 1e6,
+                "args": {"cpu_ms": cpu * 1e3},
+            })
+
+    def count(self, name: str) -> None:
+        """Add one call to a counter."""
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def timed(self, func: Callable, name: str) -> Callable:
+        """Wrap func so every call is recorded as a run of phase name."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def counted(self, func: Callable, name: str) -> Callable:
+        """Wrap func so every call adds one to counter name."""
+        counters = self.counters
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            counters[name] = counters.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        self.phases.clear()
+        self.counters.clear()
+        self._events.clear()
+        self._origin = time.perf_counter()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Get the recorded phases as Chrome trace-event JSON.
+
+        Returns:
+            Dict with one complete ("X") event per phase run and a counter
+            ("C") event with the final call counts
+        """
+        events = list(self._events)
+        if self.counters:
+            end = max((e["ts"] + e["dur"] for e in events), default=0.0)
+            events.append({
+                "name": "calls", "ph": "C", "pid": os.getpid(), "tid": 0,
+                "ts": end, "args": dict(self.counters),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, filename: str) -> None:
+        """Write to_chrome_trace() to a JSON file."""
+        with open(filename, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def report(self) -> str:
+        """Format the phase totals and counters as a table."""
+        lines = [f"{'Phase':<34} {'Calls':>7} {'Wall (s)':>10} {'CPU (s)':>10}",
+                 "-" * 64]
+        for name, totals in sorted(self.phases.items(),
+                                   key=lambda item: -item[1].wall_time):
+            lines.append(f"{name:<34} {totals.calls:>7} "
+                         f"{totals.wall_time:>10.4f} {totals.cpu_time:>10.4f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'Counter':<34} {'Calls':>7}")
+            lines.append("-" * 42)
+            for name, calls in sorted(self.counters.items()):
+                lines.append(f"{name:<34} {calls:>7}")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
@@ -4,45 +4,921 @@ LARP Character Assignment Tool using Points System
 Finds optimal character assignments to maximize player satisfaction.
 """
 
+import codecs
 import itertools
-from typing import Dict, List, Tuple, Optional
+import os
+import re
+import struct
+import sys
+import time
+import weakref
+from array import array
+from collections.abc import Mapping
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, TextIO,
+    Tuple, Optional, Union,
+)
 import json
 
+from dependencies import numpy as np, scipy_csgraph, scipy_optimize, scipy_sparse
+from instrumentation import Stats
+from solvers import (
+    IncrementalAssignment,
+    hopcroft_karp,
+    k_best_assignments,
+    solve_bitmask_dp,
+    solve_branch_and_bound,
+    solve_shortest_augmenting_path,
+    solve_sparse_shortest_augmenting_path,
+    seating_losses,
+    solve_min_cost_flow,
+    solve_rank_maximal,
+)
+
+# A scoring system is either a fixed table of points per rank (1st choice
+# first; ranks past the end of the table score its last entry) or a function
+# building that table for a given number of characters.
+ScoreTable = Union[Sequence[float], Callable[[int], Sequence[float]]]
+
+
+def _linear_scores(num_characters: int) -> List[int]:
+    # Linear: #1=n points, #2=n-1 points, etc.
+    return list(range(num_characters, 0, -1))
+
+
+def _borda_scores(num_characters: int) -> List[int]:
+    # Borda count: #1=n-1 points, ..., last choice=0 points
+    return list(range(num_characters - 1, -1, -1))
+
+
+def _exponential_scores(num_characters: int) -> List[float]:
+    # Exponential: every rank is worth half the previous one
+    return [100 * 0.5 ** i for i in range(num_characters)]
+
+
+SCORING_SYSTEMS: Dict[str, ScoreTable] = {
+    "linear": _linear_scores,
+    # Weighted: heavily favor top choices
+    "weighted": [20, 15, 10, 5, 3, 1],
+    "borda": _borda_scores,
+    "exponential": _exponential_scores,
+}
+
+
+def register_scoring_system(name: str, scores: ScoreTable) -> None:
+    """
+    Register a scoring system usable by every LARPAssigner solver.
+
+    Args:
+        name: Name to pass as scoring_system
+        scores: Points per rank (1st choice first) or a function taking the
+                number of characters and returning such a table
+    """
+    SCORING_SYSTEMS[name] = scores
+
+
+def _solve_rectangular(engine: Callable, matrix: "np.ndarray"):
+    """
+    Run an engine that needs no more rows than columns on a points matrix,
+    solving the transposed problem when there are more players than
+    characters.
+
+    Returns:
+        Tuple of ((row, column) pairs, the engine's full result)
+    """
+    if matrix.shape[0] <= matrix.shape[1]:
+        result = engine(matrix.tolist())
+        return list(enumerate(result[0])), result
+    result = engine(matrix.T.tolist())
+    return [(i, j) for j, i in enumerate(result[0])], result
+
+
+def _solve_masked(
+        matrix: "np.ndarray", allowed: "np.ndarray", use_scipy: bool
+) -> List[Tuple[int, int]]:
+    """
+    Maximize the total points using only the cells where allowed is True.
+    An assignment of min(players, characters) pairs within allowed must
+    exist.
+
+    Returns:
+        (row, column) pairs
+    """
+    if use_scipy:
+        row_indices, col_indices = scipy_optimize.linear_sum_assignment(
+            np.where(allowed, -matrix, np.inf)
+        )
+        return list(zip(row_indices.tolist(), col_indices.tolist()))
+    engine = IncrementalAssignment(np.where(allowed, matrix, -np.inf))
+    return engine.assignment()
+
+
+# print_results() collects this many lines before each write
+_REPORT_CHUNK_LINES = 4096
+
+# Binary assigner files: magic, format version and header length, the JSON
+# header (name tables and settings), zero padding to a 64-byte boundary, then
+# the players x characters rank matrix as little-endian uint16
+_BINARY_MAGIC = b"LARPRANK"
+_BINARY_VERSION = 1
+_BINARY_PREFIX = struct.Struct("<8sII")
+_BINARY_ALIGNMENT = 64
+
+
+def _rank_typecode(num_characters: int) -> str:
+    """Smallest array typecode holding ranks 0..num_characters."""
+    return 'H' if num_characters <= 0xFFFF else 'i'
+
+
+class _RankingsView(Mapping):
+    """
+    Read-only player -> ranked characters mapping over the assigner's rank
+    storage (LARPAssigner.players). Rankings are not stored as lists; each
+    lookup rebuilds one from the player's row of ranks.
+    """
+
+    def __init__(self, assigner: "LARPAssigner"):
+        self._assigner = assigner
+
+    def __getitem__(self, player: str) -> List[str]:
+        assigner = self._assigner
+        row = assigner._player_rows[player]
+        if assigner.top_k is not None:
+            start = assigner._sparse_indptr[row]
+            end = assigner._sparse_indptr[row + 1]
+            ranks = assigner._sparse_ranks[start:end].tolist()
+            columns = assigner._sparse_columns[start:end].tolist()
+        else:
+            width = len(assigner.characters)
+            ranks = assigner._ranks[row * width:(row + 1) * width].tolist()
+            columns = range(width)
+        ranked = sorted(
+            (rank, column) for rank, column in zip(ranks, columns) if rank
+        )
+        return [assigner.characters[column] for _, column in ranked]
+
+    def __contains__(self, player: object) -> bool:
+        return player in self._assigner._player_rows
+
+    def __iter__(self):
+        return iter(self._assigner._player_rows)
+
+    def __len__(self) -> int:
+        return len(self._assigner._player_rows)
+
+
+def _invalid_rank_rows(matrix: "np.ndarray") -> "np.ndarray":
+    """
+    Find the rows of a rank matrix whose nonzero ranks do not run 1, 2, ...
+    up to the number of characters ranked, each used once.
+
+    Returns:
+        Indices of the invalid rows
+    """
+    counts = np.count_nonzero(matrix, axis=1)
+    out_of_range = ((matrix.max(axis=1, initial=0) > counts)
+                    | (matrix.min(axis=1, initial=0) < 0))
+    if out_of_range.any():
+        matrix = np.where(out_of_range[:, None], 0, matrix)
+    # Ranks within range are distinct iff they fill 1..count
+    seen = np.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=bool)
+    seen[np.arange(matrix.shape[0])[:, None], matrix] = True
+    return np.flatnonzero(
+        out_of_range | (np.count_nonzero(seen[:, 1:], axis=1) != counts)
+    )
+
+
+def _first_repeat(
+        row_ids: "np.ndarray", values: "np.ndarray", width: int
+) -> Optional[int]:
+    """
+    Find a value that occurs twice in the same row.
+
+    Args:
+        row_ids: Row of each entry
+        values: Value of each entry, in range(width)
+        width: Upper bound of the values
+
+    Returns:
+        Index of an entry whose value occurs again in its row, or None
+    """
+    keys = row_ids.astype(np.int64) * width + values
+    order = np.argsort(keys)
+    repeats = np.flatnonzero(np.diff(keys[order]) == 0)
+    return int(order[repeats[0] + 1]) if repeats.size else None
+
+
+class CacheInfo(NamedTuple):
+    """
+    Hit and miss counts of an assigner's matrix cache, counted separately
+    for points matrices (what the solvers ask for; a miss means one was
+    computed) and for the rank matrix they are built from.
+    """
+    hits: int
+    misses: int
+    rank_hits: int
+    rank_misses: int
+
+
+class _WarmStart(NamedTuple):
+    """Solver state kept between solve_assignment_incremental() calls."""
+    engine: IncrementalAssignment
+    score_vector: "np.ndarray"
+    rows: Dict[str, int]  # player -> engine row
+    changed: set  # players added, updated or removed since the last solve
+
 
 class LARPAssigner:
-    def __init__(self, num_characters: int):
+    # Recorded when instrumentation is enabled: methods timed as phases, and
+    # hot methods whose calls are only counted
+    _TIMED_METHODS = (
+        "add_players",
+        "get_rank_matrix",
+        "generate_assignment_matrix",
+        "solve_assignment_hungarian",
+        "solve_assignment_incremental",
+        "solve_assignment_sparse",
+        "solve_assignment_brute_force",
+        "solve_assignment_branch_and_bound",
+        "solve_assignment_dp",
+        "solve_assignment_with_waitlist",
+        "solve_assignment_bottleneck",
+        "solve_assignment_rank_maximal",
+        "solve_assignment_min_cost_flow",
+        "check_satisfaction_constraints",
+        "print_results",
+        "save",
+    )
+    _COUNTED_METHODS = (
+        "add_player_preferences",
+        "get_rank",
+        "calculate_points",
+        "get_score_vector",
+    )
+
+    def __init__(
+            self,
+            num_characters: int,
+            characters: Optional[List[str]] = None,
+            top_k: Optional[int] = None,
+    ):
         """
         Initialize the LARP character assigner.
 
         Args:
             num_characters: Total number of characters available
+            characters: All character names (default: the first player's
+                        ranking, or the order characters are first ranked in
+                        top-k mode)
+            top_k: If set, players rank only their top k characters and
+                   preferences are stored sparsely (see solve_assignment_sparse)
         """
+        if characters is not None and len(characters) != num_characters:
+            raise ValueError(
+                f"Expected {num_characters} characters, got {len(characters)}"
+            )
+        if characters is not None and len(set(characters)) < len(characters):
+            raise ValueError("The character list names a character twice")
+        if top_k is not None and not 1 <= top_k <= num_characters:
+            raise ValueError(f"top_k must be between 1 and {num_characters}")
+
         self.num_characters = num_characters
-        self.players: Dict[str, List[str]] = {}
+        self.top_k = top_k
+        # Player name -> ranked characters, a view rebuilt from the rank
+        # storage below
+        self.players: Mapping[str, List[str]] = _RankingsView(self)
         self.characters: List[str] = []
+        # Names are interned to integer IDs: a player's row and a character's
+        # column in the rank storage
+        self._player_rows: Dict[str, int] = {}
+        self._character_columns: Dict[str, int] = {}
+        # Dense players x characters rank matrix, stored row-major in one
+        # flat uint16 array (int32 beyond 65535 characters; 0 = character
+        # not ranked by that player)
+        typecode = _rank_typecode(num_characters)
+        self._ranks = array(typecode)
+        # Top-k mode stores the ranks in CSR layout instead: row r's ranked
+        # columns and their ranks sit at [indptr[r], indptr[r + 1])
+        self._sparse_indptr = array('q', [0])
+        self._sparse_columns = array('i')
+        self._sparse_ranks = array(typecode)
+        # How many players each character can take (default 1)
+        self.capacities: Dict[str, int] = {}
+        if characters is not None:
+            self._set_characters(characters)
+        # Scoring system name -> (score table, score vector built from it)
+        self._score_vectors: Dict[str, Tuple[ScoreTable, np.ndarray]] = {}
+        # Read-only rank matrix and scoring system name -> (score vector,
+        # points matrix) caches, dropped whenever preferences change
+        self._rank_matrix: Optional[np.ndarray] = None
+        # Weak reference to the last rank matrix viewing self._ranks
+        self._rank_view: Optional[weakref.ref] = None
+        self._points_matrices: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._rank_cache_hits = 0
+        self._rank_cache_misses = 0
+        # Scoring system name -> warm-start state of the incremental solver
+        self._warm_starts: Dict[str, _WarmStart] = {}
+        # Set by enable_instrumentation()
+        self.stats: Optional[Stats] = None
+
+    def enable_instrumentation(self, stats: Optional[Stats] = None) -> Stats:
+        """
+        Start recording wall and CPU time per phase (matrix builds, solvers,
+        reports) and call counts of hot methods such as get_rank and
+        calculate_points. The methods are wrapped on this instance only, so
+        assigners without instrumentation pay nothing.
+
+        Args:
+            stats: Stats to record into, e.g. to share one across assigners
+                   (default: a new one)
+
+        Returns:
+            The Stats being recorded into (also available as self.stats)
+        """
+        self.disable_instrumentation()
+        stats = Stats() if stats is None else stats
+        for name in self._TIMED_METHODS:
+            setattr(self, name, stats.timed(getattr(self, name), name))
+        for name in self._COUNTED_METHODS:
+            setattr(self, name, stats.counted(getattr(self, name), name))
+        self.stats = stats
+        return stats
+
+    def disable_instrumentation(self) -> None:
+        """Stop recording and restore the plain methods."""
+        for name in self._TIMED_METHODS + self._COUNTED_METHODS:
+            self.__dict__.pop(name, None)
+        self.stats = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Instrumentation wrappers are closures and weak references cannot
+        # be pickled, so assigners are pickled (e.g. for solve_batch)
+        # without them
+        state = self.__dict__.copy()
+        for name in self._TIMED_METHODS + self._COUNTED_METHODS:
+            state.pop(name, None)
+        state["stats"] = None
+        state["_rank_view"] = None
+        return state
 
     def add_player_preferences(
             self, player_name: str, ranked_characters: List[str]
     ) -> None:
         """
-        Add a player's character preferences.
+        Add a player's character preferences. The ranking must be a
+        permutation of the character list (in top-k mode, of some of it):
+        no character may be repeated or missing from the list.
 
         Args:
             player_name: Name of the player
             ranked_characters: List of characters in order of preference
                               (1st = most preferred)
         """
-        if len(ranked_characters) != self.num_characters:
+        if self.top_k is not None:
+            if not 1 <= len(ranked_characters) <= self.top_k:
+                raise ValueError(
+                    f"Player {player_name} must rank 1 to {self.top_k} "
+                    f"characters, got {len(ranked_characters)}"
+                )
+        elif len(ranked_characters) != self.num_characters:
             raise ValueError(
                 f"Player {player_name} must rank all {self.num_characters} "
                 f"characters, got {len(ranked_characters)}"
             )
 
-        self.players[player_name] = ranked_characters
+        rank_index = {
+            character: rank
+            for rank, character in enumerate(ranked_characters, 1)
+        }
+        if len(rank_index) < len(ranked_characters):
+            repeated = next(
+                character
+                for rank, character in enumerate(ranked_characters, 1)
+                if rank_index[character] != rank
+            )
+            raise ValueError(f"Player {player_name} ranked {repeated} twice")
+        if self.top_k is None and self.characters:
+            for character in ranked_characters:
+                if character not in self._character_columns:
+                    raise ValueError(
+                        f"Player {player_name} ranked unknown character "
+                        f"{character!r}"
+                    )
+
+        self._materialize()
+        self._mark_changed(player_name)
+
+        if self.top_k is not None:
+            self._register_characters(player_name, rank_index)
+            self._store_sparse_row(player_name, rank_index)
+            return
 
         # Update character list (use first player's list as reference)
         if not self.characters:
-            self.characters = ranked_characters.copy()
+            self._set_characters(ranked_characters)
+
+        self._store_rank_row(player_name, rank_index)
+
+    def add_players(
+            self,
+            rankings: Union[Iterable[Tuple[str, List[str]]], "np.ndarray"],
+            names: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Add many players' preferences at once. Every ranking is checked
+        before any is stored (complete or within top_k, no unknown or
+        repeated characters) and the ranks are written into the rank storage
+        in one go, which is much faster than calling add_player_preferences()
+        per player. A player added twice keeps the last ranking.
+
+        Args:
+            rankings: (player name, ranked characters) pairs, or an integer
+                      array of shape (players, characters) holding the
+                      1-indexed rank each player gives each character in
+                      self.characters order (0 = not ranked), as returned by
+                      get_rank_matrix()
+            names: Player names, one per array row (only with an array)
+        """
+        if names is None:
+            if isinstance(rankings, np.ndarray):
+                raise ValueError("names are required with a rank array")
+            names, column_of, new_characters, row_ids, columns, ranks = (
+                self._columns_of_rankings(list(rankings))
+            )
+            counts = np.bincount(row_ids, minlength=len(names))
+            matrix = None
+        else:
+            column_of, new_characters = self._character_columns, []
+            names, matrix = self._checked_rank_array(names, rankings)
+            counts = np.count_nonzero(matrix, axis=1)
+            if self.top_k is not None:
+                row_ids, columns = np.nonzero(matrix)
+                ranks = matrix[row_ids, columns]
+                order = np.lexsort((ranks, row_ids))
+                row_ids, columns = row_ids[order], columns[order]
+                ranks = ranks[order]
+        if not names:
+            return
+
+        if self.top_k is None:
+            bad = np.flatnonzero(counts != self.num_characters)
+            expected = f"all {self.num_characters}"
+        else:
+            bad = np.flatnonzero((counts < 1) | (counts > self.top_k))
+            expected = f"1 to {self.top_k}"
+        if bad.size:
+            raise ValueError(
+                f"Player {names[bad[0]]} must rank {expected} characters, "
+                f"got {counts[bad[0]]}"
+            )
+
+        self._materialize()
+        self._mark_changed(*names)
+        if self.top_k is not None:
+            for character in new_characters:
+                self._character_columns[character] = len(self.characters)
+                self.characters.append(character)
+        elif not self.characters:
+            self._set_characters(list(column_of))
+
+        width = len(self.characters)
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        if matrix is not None and self.top_k is None:
+            block = matrix.astype(self._ranks.typecode)
+        elif self.top_k is None:
+            block = np.zeros((len(names), width), dtype=self._ranks.typecode)
+            block[row_ids, columns] = ranks
+        new_rows = []
+        for row, name in enumerate(names):
+            if name not in self._player_rows:
+                new_rows.append(row)
+                continue
+            # Replace an existing player's ranks in place
+            if self.top_k is None:
+                start = self._player_rows[name] * width
+                self._ranks[start:start + width] = array(
+                    self._ranks.typecode, block[row].tobytes()
+                )
+            else:
+                start, end = indptr[row], indptr[row + 1]
+                self._store_sparse_row(name, {
+                    self.characters[column]: rank for column, rank in zip(
+                        columns[start:end].tolist(), ranks[start:end].tolist()
+                    )
+                })
+
+        for row in new_rows:
+            self._player_rows[names[row]] = len(self._player_rows)
+        if self.top_k is None:
+            self._ranks.frombytes(block[new_rows].tobytes())
+            return
+        is_new = np.zeros(len(names), dtype=bool)
+        is_new[new_rows] = True
+        edges = is_new[row_ids]
+        self._sparse_columns.frombytes(columns[edges].astype(np.intc).tobytes())
+        self._sparse_ranks.frombytes(
+            ranks[edges].astype(self._sparse_ranks.typecode).tobytes()
+        )
+        self._sparse_indptr.frombytes(
+            (self._sparse_indptr[-1] + np.cumsum(counts[is_new]))
+            .astype(np.int64).tobytes()
+        )
+
+    def _columns_of_rankings(
+            self, pairs: List[Tuple[str, List[str]]]
+    ) -> Tuple[List[str], Dict[str, int], List[str], "np.ndarray",
+               "np.ndarray", "np.ndarray"]:
+        """
+        Translate (player name, ranking) pairs into rank entries for
+        add_players(), rejecting unknown and repeated characters.
+
+        Returns:
+            Tuple of (player names, character -> column, characters seen for
+            the first time in top-k mode, and the row, column and rank of
+            every entry)
+        """
+        # A player named twice keeps their last ranking, but characters are
+        # numbered in the order of every ranking, as if added one by one
+        latest = dict(pairs)
+        names, rankings = list(latest), list(latest.values())
+        column_of = self._character_columns
+        new_characters: List[str] = []
+        if self.top_k is not None:
+            new_characters = [
+                character
+                for character in dict.fromkeys(itertools.chain.from_iterable(
+                    ranking for _, ranking in pairs
+                ))
+                if character not in column_of
+            ]
+            if len(self.characters) + len(new_characters) > self.num_characters:
+                raise ValueError(
+                    f"Rankings name {len(self.characters) + len(new_characters)}"
+                    f" characters, but there are only {self.num_characters}"
+                )
+            column_of = dict(column_of)
+            for character in new_characters:
+                column_of[character] = len(column_of)
+        elif not self.characters and pairs:
+            # The first player's ranking fixes the character list
+            column_of = {}
+            for character in pairs[0][1]:
+                column_of.setdefault(character, len(column_of))
+
+        counts = np.fromiter(map(len, rankings), dtype=np.int64,
+                             count=len(rankings))
+        flat = list(itertools.chain.from_iterable(rankings))
+        columns = np.fromiter(
+            map(column_of.get, flat, itertools.repeat(-1)),
+            dtype=np.intp, count=len(flat),
+        )
+        row_ids = np.repeat(np.arange(len(rankings)), counts)
+        starts = np.cumsum(counts) - counts
+        ranks = np.arange(1, len(flat) + 1) - starts[row_ids]
+
+        unknown = np.flatnonzero(columns < 0)
+        if unknown.size:
+            raise ValueError(
+                f"Player {names[row_ids[unknown[0]]]} ranked unknown "
+                f"character {flat[unknown[0]]!r}"
+            )
+        repeat = _first_repeat(row_ids, columns, len(column_of))
+        if repeat is not None:
+            raise ValueError(
+                f"Player {names[row_ids[repeat]]} ranked {flat[repeat]} twice"
+            )
+        return names, column_of, new_characters, row_ids, columns, ranks
+
+    def _checked_rank_array(
+            self, names: Sequence[str], rankings: "np.ndarray"
+    ) -> Tuple[List[str], "np.ndarray"]:
+        """
+        Check a rank array for add_players(): each row's ranks must run
+        1, 2, ... up to the number of characters ranked, each used once.
+
+        Returns:
+            Tuple of (player names, rank array), keeping the last row of a
+            player named twice
+        """
+        matrix = np.asarray(rankings)
+        if not self.characters:
+            raise ValueError("The character list must be set to add a rank array")
+        if matrix.shape != (len(names), len(self.characters)):
+            raise ValueError(
+                f"Rank array must have shape ({len(names)}, "
+                f"{len(self.characters)}), got {matrix.shape}"
+            )
+        if matrix.size and not np.issubdtype(matrix.dtype, np.integer):
+            raise ValueError("Rank array must hold integers")
+
+        latest = dict(zip(names, range(len(names))))
+        if len(latest) < len(names):
+            matrix = matrix[list(latest.values())]
+        names = list(latest)
+
+        bad = _invalid_rank_rows(matrix)
+        if bad.size:
+            raise ValueError(
+                f"Ranks of player {names[bad[0]]} must run from 1 to the "
+                f"number of characters they rank, each used once"
+            )
+        return names, matrix
+
+    def remove_player(self, player_name: str) -> None:
+        """
+        Remove a player and their preferences.
+
+        Args:
+            player_name: Name of the player
+        """
+        if player_name not in self._player_rows:
+            raise ValueError(f"Unknown player {player_name}")
+
+        self._materialize()
+        self._mark_changed(player_name)
+
+        row = self._player_rows.pop(player_name)
+        for player, other in self._player_rows.items():
+            if other > row:
+                self._player_rows[player] = other - 1
+
+        if self.top_k is not None:
+            indptr = self._sparse_indptr
+            start, end = indptr[row], indptr[row + 1]
+            del self._sparse_columns[start:end]
+            del self._sparse_ranks[start:end]
+            del indptr[row + 1]
+            for r in range(row + 1, len(indptr)):
+                indptr[r] -= end - start
+        else:
+            width = len(self.characters)
+            del self._ranks[row * width:(row + 1) * width]
+
+    def _materialize(self) -> None:
+        """
+        Make the rank storage safe to change in place: copy a binary-loaded
+        assigner into memory, and copy the array if a rank matrix viewing
+        it (see get_rank_matrix) is still in use.
+        """
+        self._rank_matrix = None
+        if not isinstance(self._ranks, array):
+            typecode = _rank_typecode(self.num_characters)
+            self._ranks = array(
+                typecode, self._ranks.astype(np.dtype(typecode)).tobytes()
+            )
+        elif self._rank_view is not None and self._rank_view() is not None:
+            self._ranks = self._ranks[:]
+        self._rank_view = None
+
+    def _mark_changed(self, *player_names: str) -> None:
+        """
+        Drop the cached matrices and record changed players for the next
+        incremental re-solve. Every method changing preferences calls this.
+        """
+        self.clear_cache()
+        for warm_start in self._warm_starts.values():
+            warm_start.changed.update(player_names)
+
+    def set_character_capacity(self, character: str, capacity: int) -> None:
+        """
+        Set how many players can be given a character, for roles such as
+        guards or cultists that are played several times. Only
+        solve_assignment_min_cost_flow() uses capacities.
+
+        Args:
+            character: Character name
+            capacity: Number of players the character can take
+        """
+        if capacity < 0:
+            raise ValueError(f"Capacity of {character} must not be negative")
+        # Once the whole character list is known, a name not in it is a typo
+        if (len(self.characters) == self.num_characters
+                and character not in self._character_columns):
+            raise ValueError(f"Capacity given for unknown character {character!r}")
+        self.capacities[character] = capacity
+
+    def _set_characters(self, characters: List[str]) -> None:
+        """Fix the character list, which orders the rank matrix columns."""
+        self.characters = list(characters)
+        for column, character in enumerate(self.characters):
+            self._character_columns.setdefault(character, column)
+
+    def _register_characters(
+            self, player_name: str, rank_index: Dict[str, int]
+    ) -> None:
+        """Add characters seen for the first time in top-k mode."""
+        for character in rank_index:
+            if character in self._character_columns:
+                continue
+            if len(self.characters) == self.num_characters:
+                raise ValueError(
+                    f"Player {player_name} ranked {character}, but all "
+                    f"{self.num_characters} characters are already known"
+                )
+            self._character_columns[character] = len(self.characters)
+            self.characters.append(character)
+
+    def _store_sparse_row(
+            self, player_name: str, rank_index: Dict[str, int]
+    ) -> None:
+        """Write a player's ranks into the CSR rank structure."""
+        columns = array('i')
+        ranks = array(self._sparse_ranks.typecode)
+        for character, rank in rank_index.items():
+            column = self._character_columns.get(character)
+            if column is not None:
+                columns.append(column)
+                ranks.append(rank)
+
+        indptr = self._sparse_indptr
+        if player_name in self._player_rows:
+            row = self._player_rows[player_name]
+            start, end = indptr[row], indptr[row + 1]
+            self._sparse_columns[start:end] = columns
+            self._sparse_ranks[start:end] = ranks
+            shift = len(columns) - (end - start)
+            for r in range(row + 1, len(indptr)):
+                indptr[r] += shift
+        else:
+            self._player_rows[player_name] = len(self._player_rows)
+            self._sparse_columns.extend(columns)
+            self._sparse_ranks.extend(ranks)
+            indptr.append(len(self._sparse_columns))
+
+    def _store_rank_row(self, player_name: str, rank_index: Dict[str, int]) -> None:
+        """Write a player's ranks into the dense rank matrix."""
+        num_columns = len(self.characters)
+        row = array(self._ranks.typecode, [0]) * num_columns
+        for character, rank in rank_index.items():
+            column = self._character_columns.get(character)
+            if column is not None:
+                row[column] = rank
+
+        if player_name in self._player_rows:
+            start = self._player_rows[player_name] * num_columns
+            self._ranks[start:start + num_columns] = row
+        else:
+            self._player_rows[player_name] = len(self._player_rows)
+            self._ranks.extend(row)
+
+    def get_rank_matrix(self) -> "np.ndarray":
+        """
+        Get the dense rank matrix.
+
+        Returns:
+            Read-only array of shape (players, characters) holding the
+            1-indexed rank each player gave each character (0 = not ranked),
+            as uint16 (int32 beyond 65535 characters). Outside top-k mode it
+            is a view of the rank storage, or of the memory-mapped file of a
+            loaded assigner, not a copy. It is cached until preferences
+            change.
+        """
+        if self._rank_matrix is not None:
+            self._rank_cache_hits += 1
+            return self._rank_matrix
+        self._rank_cache_misses += 1
+
+        shape = (len(self._player_rows), len(self.characters))
+        if self.top_k is not None:
+            indptr, columns, ranks = self.get_sparse_rank_matrix()
+            rows = np.repeat(np.arange(shape[0]), np.diff(indptr))
+            matrix = np.zeros(shape, dtype=self._sparse_ranks.typecode)
+            matrix[rows, columns] = ranks
+        elif isinstance(self._ranks, array):
+            matrix = np.frombuffer(
+                self._ranks, dtype=self._ranks.typecode
+            ).reshape(shape)
+            # While the view lives, the array cannot be resized in place
+            self._rank_view = weakref.ref(matrix)
+        else:
+            matrix = self._ranks.reshape(shape)
+
+        matrix.flags.writeable = False
+        self._rank_matrix = matrix
+        return matrix
+
+    def get_rank(self, player: str, character: str) -> Optional[int]:
+        """
+        Get the 1-indexed rank a player gave a character.
+
+        Returns:
+            The rank, or None if the player or character is unknown or the
+            player did not rank the character
+        """
+        row = self._player_rows.get(player)
+        column = self._character_columns.get(character)
+        if row is None or column is None:
+            return None
+
+        if self.top_k is not None:
+            start, end = self._sparse_indptr[row], self._sparse_indptr[row + 1]
+            for edge in range(start, end):
+                if self._sparse_columns[edge] == column:
+                    return self._sparse_ranks[edge]
+            return None
+
+        rank = int(self._ranks[row * len(self.characters) + column])
+        return rank or None
+
+    def get_sparse_rank_matrix(
+            self
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Get the ranked player-character pairs in CSR layout.
+
+        Returns:
+            Tuple of (indptr, columns, ranks): row r's ranked character
+            columns and their 1-indexed ranks are columns[indptr[r]:indptr[r+1]]
+            and ranks[indptr[r]:indptr[r+1]]
+        """
+        if self.top_k is None:
+            dense = self.get_rank_matrix()
+            rows, columns = np.nonzero(dense)
+            indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=dense.shape[0]),
+                      out=indptr[1:])
+            return indptr, columns.astype(np.intc), dense[rows, columns]
+
+        return (
+            np.frombuffer(self._sparse_indptr, dtype=np.int64).copy(),
+            np.frombuffer(self._sparse_columns, dtype=np.intc).copy(),
+            np.frombuffer(self._sparse_ranks,
+                          dtype=self._sparse_ranks.typecode).astype(np.intc),
+        )
+
+    def validate_rankings(self) -> None:
+        """
+        Check every stored ranking at once: each player's ranks must run
+        1, 2, ... over distinct characters and, outside top-k mode, cover
+        the whole character list. Rankings are already checked as they are
+        added; this is for rank matrices read from elsewhere, such as
+        binary files.
+
+        Raises:
+            ValueError: Naming the players with invalid rankings
+        """
+        if self.top_k is not None:
+            indptr, _, ranks = self.get_sparse_rank_matrix()
+            counts = np.diff(indptr)
+            row_ids = np.repeat(np.arange(len(counts)), counts)
+            # Sorted by row and rank, a valid row reads 1, 2, ..., count
+            width = len(self.characters) + 1
+            keys = np.sort(row_ids * width + np.clip(ranks, 0, width - 1))
+            expected = row_ids * width + np.arange(1, len(ranks) + 1)
+            expected -= indptr[:-1][row_ids]
+            bad = np.unique(row_ids[keys != expected])
+            bad = np.union1d(bad, np.flatnonzero(
+                (counts < 1) | (counts > self.top_k)
+            ))
+        else:
+            matrix = self.get_rank_matrix()
+            bad = np.union1d(_invalid_rank_rows(matrix), np.flatnonzero(
+                np.count_nonzero(matrix, axis=1) != self.num_characters
+            ))
+        if bad.size:
+            players = list(self._player_rows)
+            names = ", ".join(players[row] for row in bad[:5].tolist())
+            more = f" and {bad.size - 5} more" if bad.size > 5 else ""
+            raise ValueError(
+                f"Rankings of {names}{more} are not permutations of the "
+                f"character list"
+            )
+
+    def get_score_vector(self, scoring_system: str = "linear") -> "np.ndarray":
+        """
+        Get the points awarded for each rank under a scoring system.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+
+        Returns:
+            Read-only array where index r holds the points for a rank r
+            choice (index 0, an unranked character, is worth 0 points)
+        """
+        try:
+            table = SCORING_SYSTEMS[scoring_system]
+        except KeyError:
+            raise ValueError(
+                f"scoring_system must be one of: {', '.join(SCORING_SYSTEMS)}"
+            )
+
+        cached = self._score_vectors.get(scoring_system)
+        if cached is not None and cached[0] is table:
+            return cached[1]
+
+        scores = list(table(self.num_characters) if callable(table) else table)
+        if not scores:
+            raise ValueError(f"Scoring system {scoring_system} has no scores")
+        scores = scores[:self.num_characters]
+        scores += [scores[-1]] * (self.num_characters - len(scores))
+
+        vector = np.array([0] + scores)
+        vector.flags.writeable = False
+        self._score_vectors[scoring_system] = (table, vector)
+        return vector
 
     def calculate_points(
             self, player: str, character: str, scoring_system: str = "linear"
@@ -53,106 +929,285 @@ class LARPAssigner:
         Args:
             player: Player name
             character: Character name
-            scoring_system: "linear" or "weighted" scoring
+            scoring_system: Name of a registered scoring system
 
         Returns:
             Points for this assignment
         """
-        if player not in self.players:
-            return 0
+        rank = self.get_rank(player, character)  # 1-indexed
+        if rank is None:
+            return 0  # Unknown player or character not in player's list
 
-        try:
-            rank = self.players[player].index(character) + 1  # 1-indexed
-        except ValueError:
-            return 0  # Character not in player's list
-
-        if scoring_system == "linear":
-            # Linear: #1=n points, #2=n-1 points, etc.
-            return self.num_characters - rank + 1
-        elif scoring_system == "weighted":
-            # Weighted: heavily favor top choices
-            if rank == 1:
-                return 20
-            elif rank == 2:
-                return 15
-            elif rank == 3:
-                return 10
-            elif rank == 4:
-                return 5
-            elif rank == 5:
-                return 3
-            else:
-                return 1
-        else:
-            raise ValueError("scoring_system must be 'linear' or 'weighted'")
+        return self.get_score_vector(scoring_system)[rank].item()
 
     def generate_assignment_matrix(
             self, scoring_system: str = "linear"
-    ) -> Tuple[List[str], List[str], List[List[int]]]:
+    ) -> Tuple[List[str], List[str], "np.ndarray"]:
         """
         Generate the points matrix for all player-character combinations.
 
         Args:
-            scoring_system: "linear" or "weighted" scoring
+            scoring_system: Name of a registered scoring system
 
         Returns:
-            Tuple of (player_names, character_names, points_matrix)
+            Tuple of (player_names, character_names, points_matrix), where
+            the points matrix is read-only and cached until preferences
+            change
         """
         player_names = list(self.players.keys())
         character_names = self.characters.copy()
 
-        # Create points matrix
-        matrix = []
-        for player in player_names:
-            row = []
-            for character in character_names:
-                points = self.calculate_points(player, character, scoring_system)
-                row.append(points)
-            matrix.append(row)
+        scores = self.get_score_vector(scoring_system)
+        cached = self._points_matrices.get(scoring_system)
+        if cached is not None and cached[0] is scores:
+            self._cache_hits += 1
+            return player_names, character_names, cached[1]
+        self._cache_misses += 1
+
+        # Look every cell's rank up in the per-rank score vector at once
+        matrix = scores[self.get_rank_matrix()]
+        matrix.flags.writeable = False
+        self._points_matrices[scoring_system] = (scores, matrix)
 
         return player_names, character_names, matrix
 
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the hit and miss counts of the points and rank matrix caches.
+
+        Returns:
+            CacheInfo(hits, misses, rank_hits, rank_misses), where hits and
+            misses count points matrix lookups
+        """
+        return CacheInfo(self._cache_hits, self._cache_misses,
+                         self._rank_cache_hits, self._rank_cache_misses)
+
+    def clear_cache(self) -> None:
+        """Drop the cached rank and points matrices (counters are kept)."""
+        self._rank_matrix = None
+        self._points_matrices.clear()
+
     def solve_assignment_hungarian(
-            self, scoring_system: str = "linear"
+            self,
+            scoring_system: str = "linear",
+            engine: str = "auto",
+            max_rank_allowed: Optional[int] = None,
+            forbidden: Optional[Dict[str, Iterable[str]]] = None,
     ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
         """
         Solve the assignment problem using Hungarian Algorithm.
+        With more players than characters, the players left over are not
+        assigned (see solve_assignment_with_waitlist).
 
         Args:
-            scoring_system: "linear" or "weighted" scoring
+            scoring_system: Name of a registered scoring system
+            engine: "scipy" for scipy's linear_sum_assignment, "builtin" for
+                    the pure-Python shortest augmenting path solver, or
+                    "auto" to use scipy when it is installed
+            max_rank_allowed: If set, only give players characters they
+                              ranked this high or better
+            forbidden: Player -> characters that player must not get
 
         Returns:
             Tuple of (assignments_dict, total_score, assignment_details)
         """
-        try:
-            from scipy.optimize import linear_sum_assignment
-            import numpy as np
-        except ImportError:
-            raise ImportError(
-                "scipy and numpy are required for optimal assignment. "
-                "Install with: pip install scipy numpy"
+        if engine not in ("auto", "scipy", "builtin"):
+            raise ValueError("engine must be 'auto', 'scipy' or 'builtin'")
+
+        use_scipy = engine == "scipy" or (
+            engine == "auto" and scipy_optimize.is_available()
+        )
+
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+
+        if max_rank_allowed is not None or forbidden:
+            allowed = self._allowed_cells(max_rank_allowed, forbidden or {})
+            pairs = _solve_masked(matrix, allowed, use_scipy)
+        elif use_scipy:
+            # Negate (Hungarian minimizes, we want max)
+            row_indices, col_indices = scipy_optimize.linear_sum_assignment(
+                -matrix
+            )
+            pairs = zip(row_indices, col_indices)
+        else:
+            pairs, _ = _solve_rectangular(
+                solve_shortest_augmenting_path, matrix
+            )
+
+        return self._build_results(
+            player_names, character_names, matrix, pairs
+        )
+
+    def _allowed_cells(
+            self,
+            max_rank_allowed: Optional[int],
+            forbidden: Dict[str, Iterable[str]],
+    ) -> "np.ndarray":
+        """
+        Mask of the player-character pairs the hard constraints allow,
+        checked up front with a bipartite matching so that an infeasible
+        problem fails before any solve.
+
+        Returns:
+            Boolean array of shape (players, characters)
+        """
+        ranks = self.get_rank_matrix()
+        allowed = np.ones(ranks.shape, dtype=bool)
+        if max_rank_allowed is not None:
+            allowed &= (ranks > 0) & (ranks <= max_rank_allowed)
+        for player, characters in forbidden.items():
+            if player not in self._player_rows:
+                raise ValueError(f"Unknown player {player}")
+            for character in characters:
+                if character not in self._character_columns:
+                    raise ValueError(f"Unknown character {character}")
+                allowed[self._player_rows[player],
+                        self._character_columns[character]] = False
+
+        adjacency = [np.flatnonzero(row).tolist() for row in allowed]
+        matching = hopcroft_karp(adjacency, ranks.shape[1])
+        seated = sum(column >= 0 for column in matching)
+        if seated < min(ranks.shape):
+            message = (
+                f"No assignment satisfies the constraints: at most {seated} "
+                f"of {min(ranks.shape)} places can be filled"
+            )
+            stranded = [
+                player for player, row in self._player_rows.items()
+                if not adjacency[row]
+            ]
+            if stranded:
+                message += f" ({', '.join(stranded)} have no allowed character)"
+            raise ValueError(message)
+        return allowed
+
+    def solve_assignment_incremental(
+            self, scoring_system: str = "linear"
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
+        """
+        Solve the assignment problem like solve_assignment_hungarian(), but
+        keep the optimal matching and dual potentials on the assigner. Later
+        calls only re-seat the players added, updated or removed since, at
+        O(n^2) per player instead of O(n^3) for a fresh solve, which suits
+        re-solving after every single sign-up.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+        """
+        scores = self.get_score_vector(scoring_system)
+        warm_start = self._warm_starts.get(scoring_system)
+        if (warm_start is None or warm_start.score_vector is not scores
+                or warm_start.engine.num_columns != len(self.characters)):
+            player_names, _, matrix = self.generate_assignment_matrix(
+                scoring_system
             )
+            warm_start = _WarmStart(
+                IncrementalAssignment(matrix), scores,
+                {player: row for row, player in enumerate(player_names)},
+                set(),
+            )
+            self._warm_starts[scoring_system] = warm_start
+
+        engine, rows = warm_start.engine, warm_start.rows
+        for player in warm_start.changed:
+            if player not in self._player_rows:
+                if player in rows:
+                    engine.remove_row(rows.pop(player))
+            elif player in rows:
+                engine.update_row(rows[player], scores[self._rank_row(player)])
+            else:
+                rows[player] = engine.add_row(scores[self._rank_row(player)])
+        warm_start.changed.clear()
+
+        # Engine rows follow sign-up order, so map them back to the player
+        # indices of the rank storage before building the results
+        columns = dict(engine.assignment())
+        player_names = list(self.players)
+        pairs = [
+            (i, columns[rows[player]])
+            for i, player in enumerate(player_names) if rows[player] in columns
+        ]
+        points = {
+            (i, j): scores[self.get_rank(player_names[i],
+                                         self.characters[j]) or 0]
+            for i, j in pairs
+        }
+        return self._build_results(
+            player_names, self.characters, points, pairs
+        )
 
+    def solve_assignment_k_best(
+            self, scoring_system: str = "linear", k: Optional[int] = None
+    ) -> Iterator[Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]]:
+        """
+        Enumerate the best castings in order of total score with Murty's
+        algorithm, starting with the optimum of solve_assignment_hungarian().
+        Castings are produced lazily, so the caller only pays for the ones
+        it takes. With more players than characters, castings differing only
+        in who is left out count as different castings.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+            k: Stop after this many castings (default: all of them)
+
+        Yields:
+            Tuple of (assignments_dict, total_score, assignment_details),
+            best first
+        """
         player_names, character_names, matrix = self.generate_assignment_matrix(
             scoring_system
         )
+        solutions = k_best_assignments(matrix)
+        for pairs, _ in itertools.islice(solutions, k):
+            yield self._build_results(
+                player_names, character_names, matrix, pairs
+            )
 
-        # Convert to numpy array and negate (Hungarian minimizes, we want max)
-        cost_matrix = np.array(matrix) * -1
+    def _rank_row(self, player: str) -> "np.ndarray":
+        """One player's row of the dense rank matrix."""
+        row = self._player_rows[player]
+        width = len(self.characters)
+        if self.top_k is not None:
+            ranks = np.zeros(width, dtype=np.intc)
+            start, end = self._sparse_indptr[row], self._sparse_indptr[row + 1]
+            ranks[np.asarray(self._sparse_columns[start:end])] = (
+                self._sparse_ranks[start:end]
+            )
+            return ranks
+        return np.asarray(self._ranks[row * width:(row + 1) * width],
+                          dtype=np.intc)
 
-        # Solve assignment problem
-        row_indices, col_indices = linear_sum_assignment(cost_matrix)
+    def _build_results(
+            self,
+            player_names: List[str],
+            character_names: List[str],
+            matrix: "np.ndarray",
+            pairs: Iterable[Tuple[int, int]],
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int, int]]]:
+        """
+        Turn (row, column) index pairs into the results every solver returns.
+        matrix can be anything indexed by matrix[row, column], such as a
+        dict of the assigned pairs' points.
 
-        # Build results
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+        """
         assignments = {}
         assignment_details = []
         total_score = 0
 
-        for i, j in zip(row_indices, col_indices):
+        for i, j in pairs:
             player = player_names[i]
             character = character_names[j]
-            points = matrix[i][j]
-            rank = self.players[player].index(character) + 1
+            points = matrix[i, j]
+            if not isinstance(points, (int, float)):
+                points = points.item()
+            rank = self.get_rank(player, character)
 
             assignments[player] = character
             assignment_details.append((player, character, points, rank))
@@ -160,6 +1215,96 @@ class LARPAssigner:
 
         return assignments, total_score, assignment_details
 
+    def solve_assignment_sparse(
+            self, scoring_system: str = "linear", engine: str = "auto"
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
+        """
+        Solve the assignment problem using only the characters each player
+        ranked. Works on the CSR rank structure, so time and memory scale
+        with the number of ranked entries; meant for top-k mode.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+            engine: "scipy" for scipy's min_weight_full_bipartite_matching,
+                    "builtin" for the pure-Python sparse augmenting path
+                    solver, or "auto" to use scipy when it is installed
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+
+        Raises:
+            ValueError: If not every player can get a character they ranked
+        """
+        if engine not in ("auto", "scipy", "builtin"):
+            raise ValueError("engine must be 'auto', 'scipy' or 'builtin'")
+        use_scipy = engine == "scipy" or (
+            engine == "auto" and scipy_csgraph.is_available()
+        )
+
+        player_names = list(self.players.keys())
+        character_names = self.characters.copy()
+
+        indptr, columns, ranks = self.get_sparse_rank_matrix()
+        weights = self.get_score_vector(scoring_system)[ranks]
+        infeasible = (
+            "Not every player can get a character they ranked; "
+            "collect more choices per player (a larger top_k)"
+        )
+        if len(player_names) > len(character_names):
+            infeasible = (
+                "Not every character can go to a player who ranked it; "
+                "collect more choices per player (a larger top_k)"
+            )
+
+        if use_scipy:
+            # Strictly positive costs: the matching ignores zero-weight edges
+            costs = weights.max(initial=0) + 1 - weights
+            biadjacency = scipy_sparse.csr_matrix(
+                (costs, columns, indptr),
+                shape=(len(player_names), len(character_names)),
+            )
+            try:
+                row_indices, col_indices = (
+                    scipy_csgraph.min_weight_full_bipartite_matching(biadjacency)
+                )
+            except ValueError:
+                raise ValueError(infeasible)
+            pairs = list(zip(row_indices.tolist(), col_indices.tolist()))
+        elif len(player_names) <= len(character_names):
+            try:
+                assigned, _ = solve_sparse_shortest_augmenting_path(
+                    indptr.tolist(), columns.tolist(), weights.tolist(),
+                    len(character_names),
+                )
+            except ValueError:
+                raise ValueError(infeasible)
+            pairs = list(enumerate(assigned))
+        else:
+            # More players than characters: solve the transposed problem,
+            # regrouping the ranked pairs by character
+            rows = np.repeat(np.arange(len(player_names)), np.diff(indptr))
+            order = np.argsort(columns, kind="stable")
+            by_character = np.zeros(len(character_names) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(columns, minlength=len(character_names)),
+                      out=by_character[1:])
+            try:
+                assigned, _ = solve_sparse_shortest_augmenting_path(
+                    by_character.tolist(), rows[order].tolist(),
+                    weights[order].tolist(), len(player_names),
+                )
+            except ValueError:
+                raise ValueError(infeasible)
+            pairs = [(i, j) for j, i in enumerate(assigned)]
+
+        # Points of the assigned pairs, looked up in each row's CSR slice
+        points = {}
+        for i, j in pairs:
+            start, end = indptr[i], indptr[i + 1]
+            edge = start + int(np.flatnonzero(columns[start:end] == j)[0])
+            points[i, j] = weights[edge].item()
+
+        return self._build_results(player_names, character_names, points, pairs)
+
     def solve_assignment_brute_force(
             self, scoring_system: str = "linear"
     ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
@@ -168,42 +1313,303 @@ class LARPAssigner:
         WARNING: Only use for small groups (≤8 players) due to factorial complexity.
 
         Args:
-            scoring_system: "linear" or "weighted" scoring
+            scoring_system: Name of a registered scoring system
 
         Returns:
             Tuple of (best_assignments, best_score, assignment_details)
         """
-        player_names = list(self.players.keys())
-        character_names = self.characters.copy()
-
-        if len(player_names) > 8:
+        if len(self.players) > 8:
             raise ValueError(
                 "Brute force method not recommended for >8 players. "
-                "Use solve_assignment_hungarian() instead."
+                "Use solve_assignment_hungarian() or "
+                "solve_assignment_branch_and_bound() instead."
             )
 
-        best_score = -1
-        best_assignment = None
-        best_details = None
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+        # Permute the longer side so every player or character is used
+        transposed = len(player_names) > len(character_names)
+        rows = (matrix.T if transposed else matrix).tolist()
+        num_columns = len(rows[0]) if rows else 0
+
+        best_score = None
+        best_permutation = None
+
+        # Generate all possible assignments (permutations of column indices)
+        for permutation in itertools.permutations(range(num_columns), len(rows)):
+            current_score = sum(row[j] for row, j in zip(rows, permutation))
+            if best_score is None or current_score > best_score:
+                best_score = current_score
+                best_permutation = permutation
 
-        # Generate all possible assignments (permutations)
-        for char_permutation in itertools.permutations(character_names):
-            current_assignment = dict(zip(player_names, char_permutation))
-            current_score = 0
-            current_details = []
+        pairs = list(enumerate(best_permutation or ()))
+        if transposed:
+            pairs = [(i, j) for j, i in pairs]
+        return self._build_results(
+            player_names, character_names, matrix, pairs
+        )
 
-            for player, character in current_assignment.items():
-                points = self.calculate_points(player, character, scoring_system)
-                rank = self.players[player].index(character) + 1
-                current_score += points
-                current_details.append((player, character, points, rank))
+    def solve_assignment_branch_and_bound(
+            self, scoring_system: str = "linear"
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
+        """
+        Solve the assignment problem exactly by branch and bound.
+        Does not need scipy and shares no code with the Hungarian engines,
+        so it can cross-check them. The bound comes from the prices of an
+        auction algorithm, which are near-optimal dual values, so ~20
+        players take a few milliseconds even with near-unanimous
+        preferences.
 
-            if current_score > best_score:
-                best_score = current_score
-                best_assignment = current_assignment
-                best_details = current_details
+        Args:
+            scoring_system: Name of a registered scoring system
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+        """
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+
+        pairs, _ = _solve_rectangular(solve_branch_and_bound, matrix)
+
+        return self._build_results(
+            player_names, character_names, matrix, pairs
+        )
+
+    def solve_assignment_dp(
+            self, scoring_system: str = "linear", return_unique: bool = False
+    ):
+        """
+        Solve the assignment problem exactly by dynamic programming over
+        subsets of characters. Does not need scipy; O(n * 2^n) time and
+        memory, so casts are limited to 22 players or characters (about
+        100 MB of tables at that size).
+
+        Args:
+            scoring_system: Name of a registered scoring system
+            return_unique: Also return whether the optimum is unique
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details),
+            followed by optimum_is_unique if return_unique is set
+        """
+        if max(len(self.players), len(self.characters)) > 22:
+            raise ValueError(
+                "Dynamic programming method not recommended for >22 "
+                "players or characters. Use solve_assignment_hungarian() "
+                "instead."
+            )
+
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+
+        pairs, (_, _, unique) = _solve_rectangular(solve_bitmask_dp, matrix)
+
+        results = self._build_results(
+            player_names, character_names, matrix, pairs
+        )
+        if return_unique:
+            return results + (unique,)
+        return results
+
+    def solve_assignment_with_waitlist(
+            self, scoring_system: str = "linear", engine: str = "auto"
+    ):
+        """
+        Solve the assignment problem when there may be more players than
+        characters, and put the players left over on a waitlist.
+
+        The waitlist is ordered by marginal loss: how much the total score
+        would drop if that player had to be given a character (moving other
+        players as needed). The first player on it is the cheapest to seat
+        when a character frees up.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+            engine: Hungarian engine, as for solve_assignment_hungarian
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details,
+            waitlist) where waitlist is a list of (player, marginal_loss)
+        """
+        assignments, total_score, details = self.solve_assignment_hungarian(
+            scoring_system, engine
+        )
+        if len(self.players) <= len(self.characters):
+            return assignments, total_score, details, []
+
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+        player_rows = {player: i for i, player in enumerate(player_names)}
+        character_columns = {
+            character: j for j, character in enumerate(character_names)
+        }
+        row_of_column = [0] * len(character_names)
+        for player, character in assignments.items():
+            row_of_column[character_columns[character]] = player_rows[player]
+
+        losses = seating_losses(matrix, row_of_column)
+        waitlist = sorted(
+            ((player_names[i], loss) for i, loss in losses.items()),
+            key=lambda entry: entry[1],
+        )
+        return assignments, total_score, details, waitlist
+
+    def solve_assignment_bottleneck(
+            self, scoring_system: str = "linear", engine: str = "auto"
+    ):
+        """
+        Solve the assignment problem so that the worst rank anyone gets is as
+        good as possible, then maximize the total score among the castings
+        with that worst rank. The smallest k for which every player can get
+        a top-k choice is found by binary search, checking each k with a
+        Hopcroft-Karp matching warm-started from the previous one, so this
+        costs O(n^2.5 log n) plus one assignment solve. With more players
+        than characters, every character must go to a player who ranked it
+        in their top k and the players left over are not assigned.
+
+        Args:
+            scoring_system: Name of a registered scoring system
+            engine: Hungarian engine, as for solve_assignment_hungarian
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details,
+            max_rank) where max_rank is the smallest achievable worst rank
+        """
+        if engine not in ("auto", "scipy", "builtin"):
+            raise ValueError("engine must be 'auto', 'scipy' or 'builtin'")
+        use_scipy = engine == "scipy" or (
+            engine == "auto" and scipy_optimize.is_available()
+        )
+
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+        ranks = self.get_rank_matrix()
+        target = min(ranks.shape)
+        if target == 0:
+            return {}, 0, [], 0
+
+        by_rank = self._columns_by_rank()
+        max_rank = by_rank.shape[1]
+        player_rows = np.arange(ranks.shape[0])
+
+        def matching_within(k: int, column_of_row: List[int]) -> List[int]:
+            adjacency = [
+                [column for column in row if column >= 0]
+                for row in by_rank[:, :k].tolist()
+            ]
+            # Keep the pairs of the previous matching that are still allowed
+            matched = np.array(column_of_row, dtype=np.intp)
+            matched[ranks[player_rows, matched] > k] = -1
+            return hopcroft_karp(adjacency, ranks.shape[1], matched.tolist())
+
+        def is_complete(column_of_row: List[int]) -> bool:
+            return sum(column >= 0 for column in column_of_row) == target
+
+        # Double k until every player fits, then binary search below it;
+        # each matching is a valid start for the next k tried
+        low, high = 1, 1
+        column_of_row = matching_within(high, [-1] * ranks.shape[0])
+        while not is_complete(column_of_row):
+            if high == max_rank:
+                raise ValueError(
+                    "Not every player can get a character they ranked"
+                )
+            low, high = high + 1, min(2 * high, max_rank)
+            column_of_row = matching_within(high, column_of_row)
+        while low < high:
+            middle = (low + high) // 2
+            candidate = matching_within(middle, column_of_row)
+            if is_complete(candidate):
+                high = middle
+                column_of_row = candidate
+            else:
+                low = middle + 1
+
+        allowed = (ranks > 0) & (ranks <= high)
+        pairs = _solve_masked(matrix, allowed, use_scipy)
+        results = self._build_results(
+            player_names, character_names, matrix, pairs
+        )
+        return results + (high,)
+
+    def _columns_by_rank(self) -> "np.ndarray":
+        """
+        Get each player's characters in order of preference.
+
+        Returns:
+            Array where [i, r - 1] is the column of the character player i
+            ranked r (-1 where player i ranked no character r)
+        """
+        ranks = self.get_rank_matrix()
+        rows, columns = np.nonzero(ranks)
+        max_rank = int(ranks.max()) if ranks.size else 0
+        by_rank = np.full((ranks.shape[0], max_rank), -1, dtype=np.intp)
+        by_rank[rows, ranks[rows, columns] - 1] = columns
+        return by_rank
+
+    def solve_assignment_rank_maximal(
+            self, scoring_system: str = "linear"
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
+        """
+        Find a rank-maximal assignment: as many first choices as possible,
+        then as many second choices as possible, and so on. This is solved
+        combinatorially (see solve_rank_maximal) rather than with huge
+        lexicographic weights. Players are only given characters they ranked,
+        so in top-k mode some may be left unassigned.
+
+        Args:
+            scoring_system: Name of a registered scoring system, used only
+                            to report the points of the result
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+        """
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+        columns = solve_rank_maximal(
+            self._columns_by_rank().tolist(), len(character_names)
+        )
+
+        return self._build_results(
+            player_names, character_names, matrix,
+            [(i, j) for i, j in enumerate(columns) if j >= 0]
+        )
+
+    def solve_assignment_min_cost_flow(
+            self, scoring_system: str = "linear"
+    ) -> Tuple[Dict[str, str], int, List[Tuple[str, str, int]]]:
+        """
+        Solve the assignment problem with character capacities (see
+        set_character_capacity) as a min-cost flow. Capacities are handled
+        directly rather than by repeating columns, so thousands of players
+        over a few hundred roles stay fast. Players beyond the total
+        capacity are left unassigned.
 
-        return best_assignment, best_score, best_details
+        Args:
+            scoring_system: Name of a registered scoring system
+
+        Returns:
+            Tuple of (assignments_dict, total_score, assignment_details)
+        """
+        player_names, character_names, matrix = self.generate_assignment_matrix(
+            scoring_system
+        )
+        capacities = [
+            self.capacities.get(character, 1) for character in character_names
+        ]
+
+        columns, _ = solve_min_cost_flow(matrix, capacities)
+
+        return self._build_results(
+            player_names, character_names, matrix,
+            [(i, j) for i, j in enumerate(columns) if j >= 0]
+        )
 
     def check_satisfaction_constraints(
             self, assignments: Dict[str, str], max_rank_allowed: int = None
@@ -221,9 +1627,15 @@ class LARPAssigner:
         unsatisfied = []
 
         for player, character in assignments.items():
-            rank = self.players[player].index(character) + 1
-
-            if max_rank_allowed and rank > max_rank_allowed:
+            rank = self.get_rank(player, character)
+
+            if not max_rank_allowed:
+                continue
+            if rank is None:
+                # Top-k mode: a character the player did not rank
+                unsatisfied.append(f"{player} got an unranked character "
+                                   f"({character})")
+            elif rank > max_rank_allowed:
                 unsatisfied.append(
                     f"{player} got rank {rank} choice ({character})"
                 )
@@ -236,42 +1648,164 @@ class LARPAssigner:
             total_score: int,
             details: List[Tuple[str, str, int, int]],
             scoring_system: str = "linear",
+            file: Optional[TextIO] = None,
     ) -> None:
-        """Print formatted results."""
-        print(f"\n{'=' * 60}")
-        print(f"OPTIMAL LARP CHARACTER ASSIGNMENT")
-        print(f"{'=' * 60}")
-        print(f"Scoring System: {scoring_system.title()}")
-        print(f"Total Satisfaction Score: {total_score}")
-        print(f"Average Score per Player: {total_score / len(assignments):.1f}")
-
-        print(f"\n{'Player':<15} {'Character':<15} {'Rank':<6} {'Points':<8}")
-        print("-" * 50)
-
-        # Sort by rank for better readability
-        sorted_details = sorted(details, key=lambda x: x[3])
-
-        for player, character, points, rank in sorted_details:
-            print(f"{player:<15} {character:<15} #{rank:<5} {points:<8}")
-
-        # Statistics
-        ranks = [detail[3] for detail in details]
-        rank_counts = {}
-        for i in range(1, self.num_characters + 1):
-            rank_counts[i] = ranks.count(i)
-
-        print(f"\n{'Rank Distribution:'}")
-        for rank, count in rank_counts.items():
+        """
+        Print formatted results. The rank statistics come from one pass over
+        the details and the table is ordered by a bucket sort on rank, so
+        reports stay linear in the number of players; output is written in
+        large chunks rather than line by line.
+
+        Args:
+            assignments: Player -> Character assignments
+            total_score: Total points of the assignment
+            details: (player, character, points, rank) per assignment
+            scoring_system: Name of the scoring system, for the header
+            file: File-like object to write to (default: sys.stdout)
+        """
+        out = sys.stdout if file is None else file
+        lines = []
+
+        def emit(line: str = "") -> None:
+            lines.append(line)
+            if len(lines) >= _REPORT_CHUNK_LINES:
+                flush()
+
+        def flush() -> None:
+            if lines:
+                out.write("\n".join(lines) + "\n")
+                lines.clear()
+
+        emit(f"\n{'=' * 60}")
+        emit(f"OPTIMAL LARP CHARACTER ASSIGNMENT")
+        emit(f"{'=' * 60}")
+        emit(f"Scoring System: {scoring_system.title()}")
+        emit(f"Total Satisfaction Score: {total_score}")
+        emit(f"Average Score per Player: "
+             f"{total_score / max(len(assignments), 1):.1f}")
+
+        emit(f"\n{'Player':<15} {'Character':<15} {'Rank':<6} {'Points':<8}")
+        emit("-" * 50)
+
+        # Bucket the rows by rank (unranked last): a stable sort by rank
+        # and the rank histogram in a single pass
+        buckets: List[list] = [[] for _ in range(self.num_characters + 2)]
+        for detail in details:
+            rank = detail[3]
+            buckets[rank if rank is not None else -1].append(detail)
+
+        for bucket in buckets:
+            for player, character, points, rank in bucket:
+                rank_label = "-" if rank is None else rank
+                emit(f"{player:<15} {character:<15} #{rank_label:<5} {points:<8}")
+
+        rank_counts = [len(bucket) for bucket in buckets]
+        emit(f"\n{'Rank Distribution:'}")
+        for rank, count in enumerate(rank_counts[1:-1], 1):
             if count > 0:
-                print(f"  Rank #{rank}: {count} players")
+                emit(f"  Rank #{rank}: {count} players")
+        if rank_counts[-1]:
+            emit(f"  Unranked: {rank_counts[-1]} players")
 
-        print(f"\nFirst choice assignments: {rank_counts[1]}")
-        print(f"Top 3 choice assignments: {sum(rank_counts[i] for i in [1, 2, 3])}")
+        emit(f"\nFirst choice assignments: {rank_counts[1]}")
+        emit(f"Top 3 choice assignments: {sum(rank_counts[1:-1][:3])}")
+        flush()
 
+    def save(self, filename: str) -> None:
+        """
+        Save the assigner to a compact binary file: a header with the
+        character and player names followed by the rank matrix as uint16.
+        LARPAssigner.load() memory-maps it back without parsing.
+
+        Args:
+            filename: Path of the file to write
+        """
+        if self.top_k is not None:
+            raise ValueError("Binary files are not supported in top-k mode")
+        if len(self.characters) > np.iinfo(np.uint16).max:
+            raise ValueError("Binary files support at most 65535 characters")
+
+        header = json.dumps({
+            "num_characters": self.num_characters,
+            "characters": self.characters,
+            "players": list(self._player_rows),
+            "capacities": self.capacities,
+        }).encode('utf-8')
+        offset = _BINARY_PREFIX.size + len(header)
+        padding = -offset % _BINARY_ALIGNMENT
+
+        with open(filename, 'wb') as f:
+            f.write(_BINARY_PREFIX.pack(
+                _BINARY_MAGIC, _BINARY_VERSION, len(header)
+            ))
+            f.write(header)
+            f.write(b"\0" * padding)
+            f.write(np.array(self._ranks, dtype="<u2").tobytes())
+
+    @classmethod
+    def load(cls, filename: str, validate: bool = False) -> "LARPAssigner":
+        """
+        Load an assigner saved with save(). The rank matrix is memory-mapped
+        read-only and get_rank_matrix() returns the mapping itself, so
+        loading is instant and processes loading the same file share its
+        pages; it is copied into memory only if preferences change later.
+
+        Args:
+            filename: Path of the file to read
+            validate: Check every ranking with validate_rankings(), for
+                      files from untrusted sources (reads the whole matrix)
 
-def load_from_json(filename: str) -> LARPAssigner:
+        Returns:
+            The loaded LARPAssigner
+        """
+        with open(filename, 'rb') as f:
+            prefix = f.read(_BINARY_PREFIX.size)
+            if len(prefix) < _BINARY_PREFIX.size:
+                raise ValueError(f"{filename} is not a LARP assigner file")
+            magic, version, header_size = _BINARY_PREFIX.unpack(prefix)
+            if magic != _BINARY_MAGIC:
+                raise ValueError(f"{filename} is not a LARP assigner file")
+            if version != _BINARY_VERSION:
+                raise ValueError(
+                    f"{filename} has unsupported format version {version}"
+                )
+            header = json.loads(f.read(header_size).decode('utf-8'))
+
+        offset = _BINARY_PREFIX.size + header_size
+        offset += -offset % _BINARY_ALIGNMENT
+        size = len(header["players"]) * len(header["characters"])
+
+        assigner = cls(header["num_characters"], header["characters"] or None)
+        assigner.capacities = header["capacities"]
+        assigner._player_rows = {
+            player: row for row, player in enumerate(header["players"])
+        }
+        if size:
+            assigner._ranks = np.memmap(
+                filename, dtype="<u2", mode='r', offset=offset, shape=(size,)
+            )
+        else:
+            assigner._ranks = np.zeros(0, dtype="<u2")
+        if validate:
+            assigner.validate_rankings()
+        return assigner
+
+
+# load_from_json() adds players in bulk from this many on; below it, importing
+# numpy would cost more than bulk loading saves
+_BULK_LOAD_MIN_PLAYERS = 256
+
+
+def load_from_json(
+        filename: str,
+        top_k: Optional[int] = None,
+        stats: Optional[Stats] = None,
+) -> LARPAssigner:
     """
     Load player preferences from JSON file.
+    With top_k set, players may rank just their top k characters.
+    With stats set, loading is recorded as the "load_from_json" phase and
+    instrumentation is enabled on the assigner (see enable_instrumentation).
 
     Expected format:
     {
@@ -279,21 +1813,334 @@ def load_from_json(filename: str) -> LARPAssigner:
         "players": {
             "Player1": ["Character2", "Character1", ...],
             "Player2": ["Character1", "Character3", ...]
-        }
+        },
+        "capacities": {"Character1": 3}  (optional, default 1)
     }
     """
+    if stats is not None:
+        with stats.phase("load_from_json"):
+            assigner = load_from_json(filename, top_k)
+        assigner.enable_instrumentation(stats)
+        return assigner
+
     with open(filename, 'r') as f:
         data = json.load(f)
 
     characters = data['characters']
-    assigner = LARPAssigner(len(characters))
+    assigner = LARPAssigner(len(characters), characters, top_k=top_k)
+
+    players = data['players']
+    if len(players) >= _BULK_LOAD_MIN_PLAYERS:
+        assigner.add_players(players.items())
+    else:
+        for player, preferences in players.items():
+            assigner.add_player_preferences(player, preferences)
 
-    for player, preferences in data['players'].items():
-        assigner.add_player_preferences(player, preferences)
+    for character, capacity in data.get('capacities', {}).items():
+        assigner.set_character_capacity(character, capacity)
 
     return assigner
 
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Characters that could still extend a number decoded at the buffer end
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+# A decode error this close to the buffer end may be a value cut off there
+# (a literal, an escape or a number), so it is retried with more text
+_CUT_OFF_MARGIN = 16
+
+
+class _JSONStream:
+    """
+    Incremental reader for one JSON document, decoding a value at a time
+    from a sliding buffer so that only the current value is held in memory.
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ""
+        self._pos = 0
+        # Characters dropped from the front of the buffer, so positions in
+        # errors are offsets into the whole file
+        self._consumed = 0
+        self._eof = False
+
+    @property
+    def bytes_read(self) -> int:
+        return self._file.tell()
+
+    def _fill(self, size: int) -> bool:
+        """Read at least size more bytes; False at end of file."""
+        if self._eof:
+            return False
+        data = self._file.read(max(size, self._chunk_size))
+        self._eof = not data
+        # Drop what has been consumed before appending
+        self._consumed += self._pos
+        self._buffer = self._buffer[self._pos:] + self._text.decode(
+            data, final=self._eof
+        )
+        self._pos = 0
+        return not self._eof
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(0):
+                return ""
+
+    def _error(self, message: str, pos: int) -> ValueError:
+        return ValueError(
+            f"Invalid JSON: {message} (char {self._consumed + pos})"
+        )
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise self._error(
+                f"expected {char!r}, got {found or 'end of file'!r}", self._pos
+            )
+        self._pos += 1
+
+    def key(self) -> str:
+        """Decode an object member's name and the ':' after it."""
+        pos = self._pos
+        name = self.value()
+        if not isinstance(name, str):
+            raise self._error("object keys must be strings", pos)
+        self.expect(':')
+        return name
+
+    def members(self) -> Iterator[str]:
+        """
+        Read an object one member at a time: yield each member's name, with
+        the stream positioned at its value, which the caller must consume.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            yield self.key()
+            found = self.peek()
+            if found == '}':
+                self._pos += 1
+                return
+            if found != ',':
+                raise self._error(
+                    f"expected ',' or '}}', got {found or 'end of file'!r}",
+                    self._pos,
+                )
+            self._pos += 1
+
+    def expect_end(self) -> None:
+        """Check that nothing but whitespace follows the document."""
+        if self.peek():
+            raise self._error("extra data after the document", self._pos)
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                # Strings are only unterminated when cut off by the buffer
+                # end; any other error well before it is malformed JSON, and
+                # reading on would pull the rest of the file into memory
+                cut_off = (
+                    error.pos >= len(self._buffer) - _CUT_OFF_MARGIN
+                    or error.msg.startswith("Unterminated string")
+                )
+                if self._eof or not cut_off:
+                    raise self._error(error.msg, error.pos)
+                # Read more (doubling the pending text so retries stay
+                # cheap) and try again
+                self._fill(len(self._buffer) - self._pos)
+                continue
+            # A number cut off by the buffer end decodes as its prefix (12
+            # from "12.5"), so read on until something else follows it
+            if (not self._eof and isinstance(value, (int, float))
+                    and _NUMBER_TAIL.match(self._buffer, end)):
+                self._fill(0)
+                continue
+            self._pos = end
+            return value
+
+
+def stream_from_json(
+        filename: str,
+        top_k: Optional[int] = None,
+        progress: Optional[Callable[[int, int, int], None]] = None,
+        progress_every: int = 1000,
+        chunk_size: int = 1 << 16,
+        stats: Optional[Stats] = None,
+) -> LARPAssigner:
+    """
+    Load player preferences from a JSON file without reading it all at
+    once, for exports too large for load_from_json.
+
+    The file has the same format as for load_from_json, but "characters"
+    must come before "players". The JSON syntax is checked as it is read,
+    and players are parsed one at a time and added with
+    add_player_preferences(), which checks each ranking against the
+    character list.
+
+    Args:
+        filename: Path to the JSON file
+        top_k: As for load_from_json
+        progress: Called as progress(players_loaded, bytes_read, total_bytes)
+                  every progress_every players and once at the end
+        progress_every: Number of players between progress calls
+        chunk_size: Bytes read from the file at a time
+        stats: If set, record loading as the "stream_from_json" phase and
+               enable instrumentation on the assigner
+
+    Returns:
+        The loaded LARPAssigner
+    """
+    if stats is not None:
+        with stats.phase("stream_from_json"):
+            assigner = stream_from_json(
+                filename, top_k, progress, progress_every, chunk_size
+            )
+        assigner.enable_instrumentation(stats)
+        return assigner
+
+    total_bytes = os.path.getsize(filename)
+    assigner = None
+    capacities = {}
+    loaded = 0
+
+    with open(filename, 'rb') as f:
+        stream = _JSONStream(f, chunk_size)
+        for key in stream.members():
+            if key == 'characters':
+                characters = stream.value()
+                if not isinstance(characters, list):
+                    raise ValueError('"characters" must be a list')
+                assigner = LARPAssigner(len(characters), characters, top_k=top_k)
+            elif key == 'players':
+                if assigner is None:
+                    raise ValueError(
+                        '"characters" must come before "players" to stream '
+                        f'{filename}; use load_from_json() instead'
+                    )
+                for player in stream.members():
+                    ranking = stream.value()
+                    if not isinstance(ranking, list):
+                        raise ValueError(
+                            f"Ranking of player {player} must be a list"
+                        )
+                    assigner.add_player_preferences(player, ranking)
+                    loaded += 1
+                    if progress is not None and loaded % progress_every == 0:
+                        progress(loaded, stream.bytes_read, total_bytes)
+            elif key == 'capacities':
+                capacities = stream.value()
+            else:
+                stream.value()
+        stream.expect_end()
+
+    if assigner is None:
+        raise ValueError(f"{filename} has no \"characters\" list")
+    for character, capacity in capacities.items():
+        assigner.set_character_capacity(character, capacity)
+    if progress is not None:
+        progress(loaded, total_bytes, total_bytes)
+    return assigner
+
+
+# LARPAssigner methods solve_batch() can run: each takes the scoring system
+# and returns (assignments_dict, total_score, assignment_details, ...)
+_BATCH_SOLVERS = (
+    "solve_assignment_hungarian",
+    "solve_assignment_incremental",
+    "solve_assignment_sparse",
+    "solve_assignment_brute_force",
+    "solve_assignment_branch_and_bound",
+    "solve_assignment_dp",
+    "solve_assignment_with_waitlist",
+    "solve_assignment_bottleneck",
+    "solve_assignment_rank_maximal",
+    "solve_assignment_min_cost_flow",
+)
+
+
+class GameResult(NamedTuple):
+    """Result of one game solved by solve_batch()."""
+    assignments: Dict[str, str]
+    total_score: int
+    details: List[Tuple[str, str, int, int]]
+    load_time: float  # seconds spent loading the game (0 for assigners)
+    solve_time: float  # seconds spent in the solver
+
+
+def _solve_game(task: Tuple[Union[LARPAssigner, str], str, str]) -> GameResult:
+    """Load (if given a path) and solve one game; runs in a worker process."""
+    game, solver, scoring_system = task
+    load_time = 0.0
+    if isinstance(game, str):
+        start = time.perf_counter()
+        if game.endswith('.json'):
+            game = load_from_json(game)
+        else:
+            game = LARPAssigner.load(game)
+        load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    assignments, total_score, details = getattr(game, solver)(scoring_system)[:3]
+    solve_time = time.perf_counter() - start
+    return GameResult(assignments, total_score, details, load_time, solve_time)
+
+
+def solve_batch(
+        games: Iterable[Union[LARPAssigner, str]],
+        scoring_system: str = "linear",
+        solver: str = "solve_assignment_hungarian",
+        max_workers: Optional[int] = None,
+        chunksize: int = 1,
+) -> List[GameResult]:
+    """
+    Solve many independent games in parallel on a process pool.
+
+    Args:
+        games: Assigners, or paths to JSON files or files written by
+               LARPAssigner.save(); paths are loaded in the workers
+        scoring_system: Name of a registered scoring system
+        solver: Name of the LARPAssigner solve_assignment_* method to use
+                (any returning a result tuple, so not
+                solve_assignment_k_best)
+        max_workers: Worker processes (default: one per CPU); 1 solves in
+                     this process without a pool
+        chunksize: Games sent to a worker at a time; raise it for many small
+                   games to cut inter-process overhead
+
+    Returns:
+        One GameResult per game, in input order
+    """
+    if solver not in _BATCH_SOLVERS:
+        raise ValueError(
+            f"solver must be one of {', '.join(_BATCH_SOLVERS)}, got {solver!r}"
+        )
+
+    tasks = [(game, solver, scoring_system) for game in games]
+    if max_workers == 1:
+        return [_solve_game(task) for task in tasks]
+
+    # Imported here: it pulls in multiprocessing, which would slow down
+    # every `import main`
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_solve_game, tasks, chunksize=chunksize))
+
+
 def main():
     """Example usage of the LARP Character Assigner."""
 
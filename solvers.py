@@ -0,0 +1,1118 @@
+"""
+Assignment engines for the LARP Character Assignment Tool.
+
+Each engine works on a points matrix (rows = players, columns = characters)
+and maximizes the total points. None of them need scipy, so they can be used
+where it is not installed. IncrementalAssignment keeps a solution optimal as
+rows change.
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dependencies import numpy as np
+
+
+def solve_branch_and_bound(
+        matrix: Sequence[Sequence[float]]
+) -> Tuple[List[int], float]:
+    """
+    Find a maximum-score assignment by depth-first branch and bound.
+
+    Rows are assigned one at a time, highest regret first, trying each row's
+    columns from best to worst. A branch is pruned when its partial score
+    plus an upper bound on the remaining rows cannot beat the best assignment
+    found so far. The bound gives every remaining row its best still-free
+    column relative to column potentials v, plus the sum of v over the free
+    columns.
+
+    v comes from an epsilon-scaling auction (see _auction_prices), which
+    shares no code with the other engines. Any v >= 0 gives a valid bound;
+    the auction's v is within half the pruning tolerance of an optimal dual
+    solution, so the bound is tight and plateaus of tied cells, as with consensus
+    preferences, are pruned instead of searched exhaustively. The auction's
+    assignment seeds the incumbent.
+
+    Args:
+        matrix: Points matrix with no more rows than columns
+
+    Returns:
+        Tuple of (column assigned to each row, total_score)
+    """
+    rows = [list(row) for row in matrix]
+    num_rows = len(rows)
+    num_columns = len(rows[0]) if rows else 0
+    if num_rows > num_columns:
+        raise ValueError(
+            f"Cannot assign {num_rows} rows to {num_columns} columns"
+        )
+
+    # Scores are sums of at most num_rows cells; do not branch on a bound
+    # that beats the incumbent only by float rounding
+    tolerance = 1e-9 * num_rows * (
+        1 + max((abs(value) for row in rows for value in row), default=0)
+    )
+    # Near-optimal assignment and dual column potentials; the potentials are
+    # never negative, so the bound stays valid when spare columns go unused
+    incumbent, potentials = _auction_prices(rows, num_columns, tolerance / 2)
+    best_score = sum(row[j] for row, j in zip(rows, incumbent))
+    reduced = [
+        [value - v for value, v in zip(row, potentials)] for row in rows
+    ]
+
+    # Branch on the rows that lose most by missing their best column first;
+    # their choices settle the rest of the search soonest
+    def regret(i: int) -> float:
+        best_two = sorted(reduced[i], reverse=True)[:2]
+        return best_two[0] - best_two[-1]
+
+    row_order = sorted(range(num_rows), key=regret, reverse=True)
+    rows = [rows[i] for i in row_order]
+    reduced = [reduced[i] for i in row_order]
+
+    # Each row's columns from best to worst reduced value
+    orders = [
+        sorted(range(num_columns), key=row.__getitem__, reverse=True)
+        for row in reduced
+    ]
+    free = [True] * num_columns
+
+    def remaining_bound(start: int) -> float:
+        # Every remaining row gets its best free column, ignoring conflicts
+        total = 0
+        for i in range(start, num_rows):
+            row = reduced[i]
+            for j in orders[i]:
+                if free[j]:
+                    total += row[j]
+                    break
+        return total
+
+    best_columns = [incumbent[i] for i in row_order]
+    columns = [0] * num_rows
+
+    def search(k: int, score: float, free_potential: float) -> None:
+        # free_potential is the sum of the potentials of the free columns
+        nonlocal best_columns, best_score
+        if k == num_rows:
+            if score > best_score:
+                best_score = score
+                best_columns = columns.copy()
+            return
+
+        row = rows[k]
+        # Taking a column can only lower the bound on the rows after k, so
+        # once a column fails against this bound every worse column will too
+        loose_bound = score + free_potential + remaining_bound(k + 1)
+        for j in orders[k]:
+            if not free[j]:
+                continue
+            if loose_bound + reduced[k][j] <= best_score + tolerance:
+                break
+            free[j] = False
+            value = score + row[j]
+            rest = free_potential - potentials[j]
+            if value + rest + remaining_bound(k + 1) > best_score + tolerance:
+                columns[k] = j
+                search(k + 1, value, rest)
+            free[j] = True
+
+    search(0, 0, sum(potentials))
+
+    assignment = [0] * num_rows
+    for k, i in enumerate(row_order):
+        assignment[i] = best_columns[k]
+    return assignment, best_score
+
+
+def _auction_prices(
+        rows: List[List[float]], num_columns: int, max_gap: float
+) -> Tuple[List[int], List[float]]:
+    """
+    Bertsekas' auction algorithm with epsilon scaling, for the bound of
+    solve_branch_and_bound().
+
+    The rows are padded with zero rows to a square problem. Unassigned rows
+    bid for their best column at its price, raising the price by their
+    margin over the second best column plus epsilon, until every row holds a
+    column; epsilon then shrinks fivefold and the bidding restarts from the
+    current prices. Each round ends epsilon-optimal, so the assignment is
+    within num_columns * epsilon of the optimum and so is the dual bound of
+    the prices.
+
+    Returns:
+        Tuple of (column assigned to each row, column prices), with the
+        prices >= 0, the cheapest 0 and the bound within max_gap of optimal
+    """
+    num_rows = len(rows)
+    if num_rows == 0:
+        return [], [0.0] * num_columns
+    padded = rows + [[0] * num_columns] * (num_columns - num_rows)
+    spread = max(max(row) for row in padded) - min(min(row) for row in padded)
+    min_epsilon = max_gap / (num_columns + 1)
+    epsilon = max(spread / 2, min_epsilon)
+    prices = [0.0] * num_columns
+
+    while True:
+        owner = [-1] * num_columns
+        column_of_row = [-1] * num_columns
+        unassigned = list(range(num_columns))
+        while unassigned:
+            i = unassigned.pop()
+            best_column, best, second = -1, -float("inf"), -float("inf")
+            for j, (value, price) in enumerate(zip(padded[i], prices)):
+                profit = value - price
+                if profit > best:
+                    best_column, best, second = j, profit, best
+                elif profit > second:
+                    second = profit
+            if num_columns == 1:
+                second = best
+            prices[best_column] += best - second + epsilon
+            previous = owner[best_column]
+            if previous >= 0:
+                column_of_row[previous] = -1
+                unassigned.append(previous)
+            owner[best_column] = i
+            column_of_row[i] = best_column
+        if epsilon <= min_epsilon:
+            break
+        epsilon = max(epsilon / 5, min_epsilon)
+
+    # The zero rows price every column alike, so shifting all prices by the
+    # same amount keeps the square bound; with the cheapest column at 0 it
+    # is also the bound of the real rows alone
+    cheapest = min(prices)
+    return column_of_row[:num_rows], [price - cheapest for price in prices]
+
+
+def solve_bitmask_dp(
+        matrix: Sequence[Sequence[float]]
+) -> Tuple[List[int], float, bool]:
+    """
+    Find a maximum-score assignment by dynamic programming over subsets.
+
+    best[mask] is the best score for giving the first popcount(mask) rows the
+    columns in mask. Subsets are processed one popcount layer at a time with
+    vectorized updates, for O(rows * 2^columns) work in total. Alongside the
+    scores, the number of optimal ways to reach each subset is tracked
+    (capped at 2) to tell whether the optimum is unique.
+
+    Args:
+        matrix: Points matrix with no more rows than columns
+
+    Returns:
+        Tuple of (column assigned to each row, total_score, optimum_is_unique)
+    """
+    weights = np.asarray(matrix, dtype=np.float64)
+    if weights.ndim != 2:
+        weights = weights.reshape(0, 0)
+    num_rows, num_columns = weights.shape
+    if num_rows > num_columns:
+        raise ValueError(
+            f"Cannot assign {num_rows} rows to {num_columns} columns"
+        )
+    if num_rows == 0:
+        return [], 0, True
+
+    # Scores are sums of at most num_rows cells; treat anything closer than
+    # float rounding over such a sum as a tie
+    tolerance = 1e-9 * num_rows * (1 + np.abs(weights).max())
+
+    size = 1 << num_columns
+    masks = np.arange(size, dtype=np.int32)
+    popcounts = np.zeros(size, dtype=np.uint8)
+    for j in range(num_columns):
+        popcounts += ((masks >> j) & 1).astype(np.uint8)
+    layers = np.argsort(popcounts, kind="stable").astype(np.int32)
+    layer_starts = np.concatenate(([0], np.cumsum(np.bincount(popcounts))))
+
+    best = np.full(size, -np.inf)
+    ways = np.zeros(size, dtype=np.uint8)
+    best[0] = 0
+    ways[0] = 1
+
+    for i in range(num_rows):
+        layer = layers[layer_starts[i + 1]:layer_starts[i + 2]]
+        for j in range(num_columns):
+            current = layer[((layer >> j) & 1).astype(bool)]
+            previous = current ^ (1 << j)
+            candidate = best[previous] + weights[i, j]
+            current_best = best[current]
+
+            better = candidate > current_best + tolerance
+            tied = ~better & (candidate >= current_best - tolerance)
+            ways[current] = np.where(
+                better,
+                ways[previous],
+                np.where(
+                    tied,
+                    np.minimum(ways[current] + ways[previous], 2),
+                    ways[current],
+                ),
+            )
+            best[current] = np.where(better, candidate, current_best)
+
+    final_layer = layers[layer_starts[num_rows]:layer_starts[num_rows + 1]]
+    final_scores = best[final_layer]
+    best_score = final_scores.max()
+    optimal = final_layer[final_scores >= best_score - tolerance]
+    unique = len(optimal) == 1 and ways[optimal[0]] == 1
+
+    # Walk back from the best final subset to recover each row's column
+    columns = [0] * num_rows
+    mask = int(optimal[0])
+    for i in range(num_rows - 1, -1, -1):
+        for j in range(num_columns):
+            bit = 1 << j
+            if mask & bit and abs(
+                    best[mask ^ bit] + weights[i, j] - best[mask]
+            ) <= tolerance:
+                columns[i] = j
+                mask ^= bit
+                break
+
+    score = sum(matrix[i][j] for i, j in enumerate(columns))
+    return columns, score, bool(unique)
+
+
+def solve_shortest_augmenting_path(
+        matrix: Sequence[Sequence[float]]
+) -> Tuple[List[int], float]:
+    """
+    Find a maximum-score assignment with the Hungarian method in its
+    shortest augmenting path form (as in Jonker-Volgenant), O(rows^2 * columns).
+
+    Rows are added one at a time. Each addition runs a Dijkstra-style search
+    over reduced costs for the cheapest path to a free column and augments
+    along it, keeping the row and column potentials dual feasible.
+
+    Args:
+        matrix: Points matrix with no more rows than columns
+
+    Returns:
+        Tuple of (column assigned to each row, total_score)
+    """
+    num_rows = len(matrix)
+    num_columns = len(matrix[0]) if num_rows else 0
+    if num_rows > num_columns:
+        raise ValueError(
+            f"Cannot assign {num_rows} rows to {num_columns} columns"
+        )
+
+    # Minimize cost = -points. Index 0 is a virtual column holding the row
+    # being added, so rows and columns below are 1-indexed.
+    costs = [None] + [[None] + [-value for value in row] for row in matrix]
+    row_potentials = [0] * (num_rows + 1)
+    column_potentials = [0] * (num_columns + 1)
+    row_of_column = [0] * (num_columns + 1)
+    previous_column = [0] * (num_columns + 1)
+    infinity = float("inf")
+    columns = range(1, num_columns + 1)
+
+    for i in range(1, num_rows + 1):
+        row_of_column[0] = i
+        column = 0
+        min_reduced = [infinity] * (num_columns + 1)
+        visited = [False] * (num_columns + 1)
+
+        while True:
+            visited[column] = True
+            row = row_of_column[column]
+            row_cost = costs[row]
+            row_potential = row_potentials[row]
+            delta = infinity
+            next_column = 0
+            for j in columns:
+                if not visited[j]:
+                    reduced = row_cost[j] - row_potential - column_potentials[j]
+                    if reduced < min_reduced[j]:
+                        min_reduced[j] = reduced
+                        previous_column[j] = column
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        next_column = j
+
+            for j in range(num_columns + 1):
+                if visited[j]:
+                    row_potentials[row_of_column[j]] += delta
+                    column_potentials[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+
+            column = next_column
+            if row_of_column[column] == 0:
+                break
+
+        # Flip the matches along the augmenting path
+        while column:
+            before = previous_column[column]
+            row_of_column[column] = row_of_column[before]
+            column = before
+
+    assignment = [0] * num_rows
+    for j in columns:
+        if row_of_column[j]:
+            assignment[row_of_column[j] - 1] = j - 1
+
+    score = sum(matrix[i][j] for i, j in enumerate(assignment))
+    return assignment, score
+
+
+def solve_sparse_shortest_augmenting_path(
+        indptr: Sequence[int],
+        columns: Sequence[int],
+        weights: Sequence[float],
+        num_columns: int,
+) -> Tuple[List[int], float]:
+    """
+    Find a maximum-score assignment that only uses the given (row, column)
+    pairs, by successive shortest augmenting paths over the sparse graph.
+
+    Each row is added with a heap-based Dijkstra search over reduced costs
+    that only visits listed pairs, so the work scales with the number of
+    pairs rather than rows * columns.
+
+    Args:
+        indptr: CSR row pointers (length rows + 1)
+        columns: CSR column of each listed pair
+        weights: Points of each listed pair
+        num_columns: Number of columns
+
+    Returns:
+        Tuple of (column assigned to each row, total_score)
+
+    Raises:
+        ValueError: If the pairs do not allow every row to be assigned
+    """
+    num_rows = len(indptr) - 1
+    if num_rows > num_columns:
+        raise ValueError(
+            f"Cannot assign {num_rows} rows to {num_columns} columns"
+        )
+
+    # Minimize cost = top - points, which is non-negative, so all-zero
+    # potentials start out dual feasible
+    top = max(weights, default=0)
+    row_potentials = [0] * num_rows
+    column_potentials = [0] * num_columns
+    row_of_column = [-1] * num_columns
+    column_of_row = [-1] * num_rows
+    infinity = float("inf")
+
+    for start in range(num_rows):
+        distance: Dict[int, float] = {}
+        reached_from: Dict[int, int] = {}
+        settled: List[int] = []
+        done = set()
+        heap: List[Tuple[float, int]] = []
+
+        def relax(row: int, base: float) -> None:
+            potential = row_potentials[row]
+            for edge in range(indptr[row], indptr[row + 1]):
+                j = columns[edge]
+                if j in done:
+                    continue
+                d = (base + top - weights[edge] - potential
+                     - column_potentials[j])
+                if d < distance.get(j, infinity):
+                    distance[j] = d
+                    reached_from[j] = row
+                    heapq.heappush(heap, (d, j))
+
+        relax(start, 0)
+        end = -1
+        while heap:
+            d, j = heapq.heappop(heap)
+            if j in done or d > distance[j]:
+                continue
+            done.add(j)
+            settled.append(j)
+            if row_of_column[j] == -1:
+                end = j
+                break
+            relax(row_of_column[j], d)
+
+        if end == -1:
+            raise ValueError(
+                f"Row {start} cannot be assigned without unassigning another"
+            )
+
+        # Shift potentials so the settled tree has zero reduced cost
+        shortest = distance[end]
+        row_potentials[start] += shortest
+        for j in settled:
+            delta = shortest - distance[j]
+            column_potentials[j] -= delta
+            if row_of_column[j] != -1:
+                row_potentials[row_of_column[j]] += delta
+
+        # Flip the matches along the augmenting path
+        j = end
+        while True:
+            row = reached_from[j]
+            next_column = column_of_row[row]
+            row_of_column[j] = row
+            column_of_row[row] = j
+            if row == start:
+                break
+            j = next_column
+
+    score = 0
+    for row, j in enumerate(column_of_row):
+        for edge in range(indptr[row], indptr[row + 1]):
+            if columns[edge] == j:
+                score += weights[edge]
+                break
+    return column_of_row, score
+
+
+def hopcroft_karp(
+        adjacency: Sequence[Sequence[int]],
+        num_columns: int,
+        column_of_row: Optional[Sequence[int]] = None,
+) -> List[int]:
+    """
+    Maximum cardinality bipartite matching with the Hopcroft-Karp algorithm,
+    O(m * sqrt(n)) for m edges.
+
+    Args:
+        adjacency: Columns each row may be matched to
+        num_columns: Number of columns
+        column_of_row: Optional starting matching (-1 = unmatched), such as
+                       the result of a previous call on a similar graph;
+                       every matched pair must be an edge of adjacency
+
+    Returns:
+        Column matched to each row (-1 = unmatched)
+    """
+    num_rows = len(adjacency)
+    if column_of_row is None:
+        column_of_row = [-1] * num_rows
+    else:
+        column_of_row = list(column_of_row)
+    row_of_column = [-1] * num_columns
+    for row, column in enumerate(column_of_row):
+        if column >= 0:
+            row_of_column[column] = row
+
+    while True:
+        # Layer the rows by alternating-path distance from the free rows
+        free_rows = [row for row in range(num_rows) if column_of_row[row] < 0]
+        layer = [-1] * num_rows
+        for row in free_rows:
+            layer[row] = 0
+        queue = free_rows[:]
+        found = False
+        for row in queue:
+            for column in adjacency[row]:
+                next_row = row_of_column[column]
+                if next_row < 0:
+                    found = True
+                elif layer[next_row] < 0:
+                    layer[next_row] = layer[row] + 1
+                    queue.append(next_row)
+        if not found:
+            return column_of_row
+
+        # Vertex-disjoint augmenting paths along the layers, by iterative DFS
+        next_edge = [0] * num_rows
+        for start in free_rows:
+            stack = [start]
+            while stack:
+                row = stack[-1]
+                edges = adjacency[row]
+                if next_edge[row] == len(edges):
+                    layer[row] = -1  # dead end for the rest of this phase
+                    stack.pop()
+                    continue
+                column = edges[next_edge[row]]
+                next_edge[row] += 1
+                next_row = row_of_column[column]
+                if next_row < 0:
+                    for row in stack:
+                        column = adjacency[row][next_edge[row] - 1]
+                        column_of_row[row] = column
+                        row_of_column[column] = row
+                    break
+                if layer[next_row] == layer[row] + 1:
+                    stack.append(next_row)
+
+
+def solve_rank_maximal(
+        choices: Sequence[Sequence[int]], num_columns: int
+) -> List[int]:
+    """
+    Find a rank-maximal matching (Irving, Kavitha, Mehlhorn, Michail and
+    Paluch): as many rows as possible get their first choice, then as many
+    as possible their second choice, and so on.
+
+    Phase i adds the rank i edges and grows the matching to a maximum one
+    with Hopcroft-Karp, starting from the previous phase's matching. The
+    Gallai-Edmonds decomposition of the result splits vertices into even,
+    odd and unreachable ones; odd and unreachable vertices are matched in
+    every maximum matching of this phase, so their later-rank edges and the
+    odd-odd and odd-unreachable edges are dropped, which is what keeps the
+    earlier ranks' counts from ever decreasing. O(min(n, C * sqrt(n)) * m)
+    for C ranks and m edges.
+
+    Args:
+        choices: Each row's columns in order of preference (1st choice
+                 first; -1 for a rank with no column)
+        num_columns: Number of columns
+
+    Returns:
+        Column matched to each row (-1 = unmatched)
+    """
+    num_rows = len(choices)
+    adjacency: List[List[int]] = [[] for _ in range(num_rows)]
+    rows_of_column: List[List[int]] = [[] for _ in range(num_columns)]
+    column_of_row = [-1] * num_rows
+    # Rows and columns not yet found odd or unreachable; only they take
+    # further (worse) edges
+    open_rows = list(range(num_rows))
+    open_columns = list(range(num_columns))
+    is_open_column = [True] * num_columns
+    max_rank = max((len(row) for row in choices), default=0)
+    even, odd = 0, 1
+
+    for rank in range(max_rank):
+        for row in open_rows:
+            row_choices = choices[row]
+            if rank < len(row_choices):
+                column = row_choices[rank]
+                if column >= 0 and is_open_column[column]:
+                    adjacency[row].append(column)
+                    rows_of_column[column].append(row)
+        column_of_row = hopcroft_karp(adjacency, num_columns, column_of_row)
+        free_rows = [row for row, column in enumerate(column_of_row)
+                     if column < 0]
+        # Once every row or column is matched, worse ranks cannot be used
+        if (rank == max_rank - 1 or not free_rows
+                or num_rows - len(free_rows) == num_columns):
+            break
+
+        row_of_column = [-1] * num_columns
+        for row, column in enumerate(column_of_row):
+            if column >= 0:
+                row_of_column[column] = row
+
+        # Alternating BFS from every free vertex: a vertex reached at even
+        # distance is even, at odd distance odd; the rest are unreachable
+        row_label = [None] * num_rows
+        column_label = [None] * num_columns
+        queue = []
+        for row in free_rows:
+            row_label[row] = even
+            queue.append((True, row))
+        for column, row in enumerate(row_of_column):
+            if row < 0:
+                column_label[column] = even
+                queue.append((False, column))
+        for is_row, vertex in queue:
+            if is_row:
+                # Even rows leave by non-matching edges, odd rows by their match
+                if row_label[vertex] == even:
+                    for column in adjacency[vertex]:
+                        if column_label[column] is None:
+                            column_label[column] = odd
+                            queue.append((False, column))
+                else:
+                    column = column_of_row[vertex]
+                    if column_label[column] is None:
+                        column_label[column] = even
+                        queue.append((False, column))
+            elif column_label[vertex] == even:
+                for row in rows_of_column[vertex]:
+                    if row_label[row] is None:
+                        row_label[row] = odd
+                        queue.append((True, row))
+            else:
+                row = row_of_column[vertex]
+                if row_label[row] is None:
+                    row_label[row] = even
+                    queue.append((True, row))
+
+        # Drop odd-odd and odd-unreachable edges (each has an odd end), and
+        # close the odd and unreachable vertices to worse ranks
+        for row in (vertex for is_row, vertex in queue if is_row):
+            if row_label[row] == odd:
+                for column in adjacency[row]:
+                    if column_label[column] != even:
+                        rows_of_column[column].remove(row)
+                adjacency[row] = [column for column in adjacency[row]
+                                  if column_label[column] == even]
+        for column in (vertex for is_row, vertex in queue if not is_row):
+            if column_label[column] == odd:
+                for row in rows_of_column[column]:
+                    if row_label[row] != even:
+                        adjacency[row].remove(column)
+                rows_of_column[column] = [row for row in rows_of_column[column]
+                                          if row_label[row] == even]
+        open_rows = [row for row in open_rows if row_label[row] == even]
+        for column in open_columns:
+            if column_label[column] != even:
+                is_open_column[column] = False
+        open_columns = [column for column in open_columns
+                        if is_open_column[column]]
+
+    return column_of_row
+
+
+def seating_losses(
+        matrix: Sequence[Sequence[float]], row_of_column: Sequence[int]
+) -> Dict[int, float]:
+    """
+    For an optimal assignment that fills every column with one of more rows,
+    how much the total score drops if each unassigned row must be seated.
+
+    Seating a waiting row means taking some column from its holder, who then
+    either waits instead or takes another column from its holder, and so on.
+    displaced[q] is the best change in score once row q loses its column;
+    it is a longest path over such moves, which the optimality of the
+    assignment keeps free of positive cycles, so it is found with vectorized
+    Bellman-Ford rounds.
+
+    Args:
+        matrix: Points matrix with more rows than columns
+        row_of_column: Row assigned to each column in an optimal assignment
+
+    Returns:
+        Dict of unassigned row -> loss in total score (>= 0)
+    """
+    weights = np.asarray(matrix, dtype=np.float64)
+    num_rows, num_columns = weights.shape
+    holders = np.asarray(row_of_column, dtype=np.intp)
+    held = weights[holders, np.arange(num_columns)]
+    holder_weights = weights[holders]
+    tolerance = 1e-9 * (1 + np.abs(weights).max(initial=0))
+
+    # Entry k is displaced[] for the holder of column k
+    displaced = np.zeros(num_columns)
+    for _ in range(num_columns + 1):
+        # Change in score from taking column k and displacing its holder
+        take = displaced - held
+        updated = np.maximum(0, (holder_weights + take).max(axis=1))
+        if np.all(updated <= displaced + tolerance):
+            break
+        displaced = updated
+
+    take = displaced - held
+    waiting = np.setdiff1d(np.arange(num_rows), holders)
+    best = (weights[waiting] + take).max(axis=1, initial=-np.inf)
+    return {
+        int(row): max(0.0, float(-gain)) for row, gain in zip(waiting, best)
+    }
+
+
+def solve_min_cost_flow(
+        matrix: Sequence[Sequence[float]], capacities: Sequence[int]
+) -> Tuple[List[int], float]:
+    """
+    Find a maximum-score assignment where column j can take up to
+    capacities[j] rows, as a min-cost flow solved by successive shortest
+    paths over the columns.
+
+    Rows are added one at a time. Column prices keep every assigned row on
+    a column maximizing points - price, which makes moving a row from column
+    a to column b cost at least 0 in reduced terms; moves[a, b] holds the
+    cheapest such move among a's rows and only changes for columns whose
+    rows change. Each new row then runs a dense Dijkstra over the columns
+    (not the rows) to the nearest column with spare capacity, shifting one
+    row per column along the path. When the rows outnumber the total
+    capacity, the rows left over go unassigned.
+
+    Args:
+        matrix: Points matrix
+        capacities: Number of rows each column can take
+
+    Returns:
+        Tuple of (column assigned to each row or -1, total_score)
+    """
+    weights = np.asarray(matrix, dtype=np.float64)
+    if weights.ndim != 2:
+        weights = weights.reshape(len(weights), len(capacities))
+    num_rows, num_columns = weights.shape
+    capacity = np.asarray(capacities, dtype=np.int64)
+    if len(capacity) != num_columns:
+        raise ValueError(
+            f"Expected {num_columns} capacities, got {len(capacity)}"
+        )
+    if np.any(capacity < 0):
+        raise ValueError("Capacities must not be negative")
+
+    # Rows beyond the total capacity go to an overflow column worth nothing
+    overflow = num_rows - int(capacity.sum())
+    if overflow > 0:
+        weights = np.hstack([weights, np.zeros((num_rows, 1))])
+        capacity = np.append(capacity, overflow)
+    size = len(capacity)
+
+    prices = np.zeros(size)
+    column_of_row = np.full(num_rows, -1, dtype=np.intp)
+    members: List[List[int]] = [[] for _ in range(size)]
+    counts = np.zeros(size, dtype=np.int64)
+    moves = np.full((size, size), np.inf)
+    movers = np.zeros((size, size), dtype=np.intp)
+
+    def refresh(column: int) -> None:
+        # Cheapest row of this column to move to each other column
+        rows = members[column]
+        if not rows:
+            moves[column] = np.inf
+            return
+        block = weights[rows]
+        loss = block[:, column:column + 1] - block
+        best = loss.argmin(axis=0)
+        moves[column] = loss[best, np.arange(size)]
+        movers[column] = np.asarray(rows)[best]
+
+    for row in range(num_rows):
+        utility = weights[row] - prices
+        distance = utility.max() - utility
+        previous = np.full(size, -1, dtype=np.intp)
+        settled = np.zeros(size, dtype=bool)
+
+        while True:
+            column = int(np.where(settled, np.inf, distance).argmin())
+            settled[column] = True
+            if counts[column] < capacity[column]:
+                break
+            relaxed = distance[column] + moves[column] - prices[column] + prices
+            better = ~settled & (relaxed < distance)
+            distance[better] = relaxed[better]
+            previous[better] = column
+
+        shortest = distance[column]
+        prices -= np.minimum(distance, shortest)
+
+        # Shift one row along each move on the path, then seat the new row
+        changed = [column]
+        while previous[column] != -1:
+            source = int(previous[column])
+            mover = int(movers[source, column])
+            members[source].remove(mover)
+            members[column].append(mover)
+            column_of_row[mover] = column
+            column = source
+            changed.append(column)
+        members[column].append(row)
+        column_of_row[row] = column
+        counts[changed[0]] += 1
+        for column in changed:
+            refresh(column)
+
+    if overflow > 0:
+        column_of_row[column_of_row == num_columns] = -1
+    assigned = np.flatnonzero(column_of_row >= 0)
+    score = weights[assigned, column_of_row[assigned]].sum().item()
+    return column_of_row.tolist(), score
+
+
+class IncrementalAssignment:
+    """
+    Maximum-score assignment that is kept optimal as rows change.
+
+    The problem is held square, with dummy rows or columns worth 0 points
+    filling the gap, together with the optimal matching and the dual
+    potentials of the shortest augmenting path method. Changing, adding or
+    removing a row then only frees that row and re-adds it with a single
+    O(n^2) augmentation, instead of solving from scratch in O(n^3).
+    """
+
+    def __init__(self, matrix: Sequence[Sequence[float]]):
+        """
+        Args:
+            matrix: Points matrix (rows x columns)
+        """
+        points = np.asarray(matrix, dtype=np.float64)
+        if points.ndim != 2:
+            points = points.reshape(len(points), 0)
+        num_rows, num_columns = points.shape
+        size = max(num_rows, num_columns)
+
+        self.num_columns = num_columns
+        self.is_real_row = np.zeros(size, dtype=bool)
+        self.is_real_row[:num_rows] = True
+        # Minimize cost = -points
+        self._costs = np.zeros((size, size))
+        self._costs[:num_rows, :num_columns] = -points
+        self._row_of_column = np.full(size, -1, dtype=np.intp)
+        self._column_of_row = np.full(size, -1, dtype=np.intp)
+
+        # Column then row reduction gives feasible starting potentials; seat
+        # every row whose cheapest column is still free without a search
+        self._column_potentials = self._costs.min(axis=0, initial=0)
+        self._row_potentials = (
+            self._costs - self._column_potentials
+        ).min(axis=1, initial=0)
+        for row in range(size):
+            reduced = (self._costs[row] - self._row_potentials[row]
+                       - self._column_potentials)
+            for column in np.flatnonzero(reduced <= 0):
+                if self._row_of_column[column] == -1:
+                    self._row_of_column[column] = row
+                    self._column_of_row[row] = column
+                    break
+        for row in range(size):
+            if self._column_of_row[row] == -1:
+                self._augment(row)
+
+    @property
+    def size(self) -> int:
+        return len(self._column_of_row)
+
+    def _augment(self, start: int) -> bool:
+        """
+        Seat an unassigned, dual feasible row by one Dijkstra search.
+
+        Returns:
+            False if the row cannot be seated (every path is forbidden)
+        """
+        costs = self._costs
+        row_potentials = self._row_potentials
+        column_potentials = self._column_potentials
+        row_of_column = self._row_of_column
+
+        # Tentative distances of unsettled columns (inf once settled)
+        pending = costs[start] - row_potentials[start] - column_potentials
+        distance = np.empty(self.size)
+        reached_from = np.full(self.size, start, dtype=np.intp)
+        unsettled = np.ones(self.size, dtype=bool)
+        relaxed = np.empty(self.size)
+        better = np.empty(self.size, dtype=bool)
+        while True:
+            column = int(pending.argmin())
+            shortest = pending[column]
+            if shortest == np.inf:
+                return False
+            distance[column] = shortest
+            pending[column] = np.inf
+            unsettled[column] = False
+            row = row_of_column[column]
+            if row == -1:
+                break
+            np.subtract(costs[row], column_potentials, out=relaxed)
+            relaxed += shortest - row_potentials[row]
+            np.less(relaxed, pending, out=better)
+            better &= unsettled
+            np.copyto(pending, relaxed, where=better)
+            np.copyto(reached_from, row, where=better)
+
+        # Shift potentials so the settled tree has zero reduced cost
+        settled = ~unsettled
+        delta = shortest - distance[settled]
+        column_potentials[settled] -= delta
+        matched = row_of_column[settled]
+        row_potentials[matched[matched >= 0]] += delta[matched >= 0]
+        row_potentials[start] += shortest
+
+        # Flip the matches along the augmenting path
+        while True:
+            row = reached_from[column]
+            next_column = self._column_of_row[row]
+            row_of_column[column] = row
+            self._column_of_row[row] = column
+            if row == start:
+                return True
+            column = next_column
+
+    def update_row(self, row: int, points: Sequence[float]) -> None:
+        """Replace a row's points and re-optimize."""
+        column = self._column_of_row[row]
+        self._row_of_column[column] = -1
+        self._column_of_row[row] = -1
+
+        self._costs[row] = 0
+        self._costs[row, :self.num_columns] = -np.asarray(points)
+        self._row_potentials[row] = (
+            self._costs[row] - self._column_potentials
+        ).min()
+        self._augment(row)
+
+    def add_row(self, points: Sequence[float]) -> int:
+        """Add a row, re-optimize and return its index."""
+        dummies = np.flatnonzero(~self.is_real_row)
+        if len(dummies):
+            row = int(dummies[0])
+        else:
+            # Grow by a dummy column, priced to stay dual feasible, and a row
+            size = self.size
+            costs = np.zeros((size + 1, size + 1))
+            costs[:size, :size] = self._costs
+            self._costs = costs
+            self._column_potentials = np.append(
+                self._column_potentials, -self._row_potentials.max(initial=0)
+            )
+            self._row_potentials = np.append(self._row_potentials, 0)
+            self._row_of_column = np.append(self._row_of_column, size)
+            self._column_of_row = np.append(self._column_of_row, size)
+            self.is_real_row = np.append(self.is_real_row, False)
+            row = size
+        self.is_real_row[row] = True
+        self.update_row(row, points)
+        return row
+
+    def remove_row(self, row: int) -> None:
+        """Turn a row into a dummy and re-optimize."""
+        self.update_row(row, np.zeros(self.num_columns))
+        self.is_real_row[row] = False
+
+    def assignment(self) -> List[Tuple[int, int]]:
+        """(row, column) pairs for the real rows given a real column."""
+        return [
+            (row, int(column))
+            for row, column in enumerate(self._column_of_row)
+            if self.is_real_row[row] and column < self.num_columns
+        ]
+
+    def copy(self) -> "IncrementalAssignment":
+        """An independent copy of the problem and its solution."""
+        clone = object.__new__(IncrementalAssignment)
+        clone.__dict__.update(
+            (name, value.copy() if hasattr(value, "copy") else value)
+            for name, value in self.__dict__.items()
+        )
+        return clone
+
+    def restrict_row(self, row: int, allowed: "np.ndarray") -> bool:
+        """
+        Forbid a row every column where allowed is False and re-optimize.
+        Raising costs keeps the potentials feasible, so only a row whose
+        column was forbidden needs re-seating.
+
+        Returns:
+            False if no assignment respects the restrictions any more
+        """
+        self._costs[row, ~allowed] = np.inf
+        column = self._column_of_row[row]
+        if allowed[column]:
+            return True
+        self._row_of_column[column] = -1
+        self._column_of_row[row] = -1
+        self._row_potentials[row] = (
+            self._costs[row] - self._column_potentials
+        ).min()
+        return self._augment(row)
+
+    def fix_rows(self, rows: Sequence[int]) -> None:
+        """
+        Keep rows on their current column (or, for a row on a dummy column,
+        unassigned) by forbidding every other choice. The matching stays
+        optimal, so nothing is re-seated.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        columns = self._column_of_row[rows]
+        on_dummy = columns >= self.num_columns
+        seated, columns = rows[~on_dummy], columns[~on_dummy]
+        kept = self._costs[seated, columns]
+        self._costs[seated] = np.inf
+        self._costs[seated, columns] = kept
+        self._costs[rows[on_dummy], :self.num_columns] = np.inf
+
+    def columns(self) -> "np.ndarray":
+        """Column of every row, dummy rows and columns included."""
+        return self._column_of_row.copy()
+
+    def reduced_costs(self) -> "np.ndarray":
+        """Reduced costs c[i, j] - u[i] - v[j]: zero on the matching."""
+        return (self._costs - self._row_potentials[:, None]
+                - self._column_potentials)
+
+    def cost(self) -> float:
+        """Total cost (negated points) of the current matching."""
+        return float(self._costs[np.arange(self.size), self._column_of_row].sum())
+
+
+def k_best_assignments(
+        matrix: Sequence[Sequence[float]]
+) -> Iterator[Tuple[List[Tuple[int, int]], float]]:
+    """
+    Enumerate assignments from best to worst with Murty's algorithm.
+
+    Each solution's remaining solution space is partitioned over its rows:
+    child t keeps the first t - 1 pairs and forbids pair t. A child starts
+    from a copy of its parent's optimal matching and potentials, so solving
+    it takes a single augmentation. Children are queued with a dual lower
+    bound on their cost increase and only solved once that bound reaches the
+    front of the queue, so most are never solved. Rows left unassigned
+    (more rows than columns) count as one choice, so every solution yielded
+    is a distinct set of pairs.
+
+    Args:
+        matrix: Points matrix (rows x columns)
+
+    Yields:
+        Tuple of ((row, column) pairs, total points), best first
+    """
+    root = IncrementalAssignment(matrix)
+    num_columns = root.num_columns
+    real_rows = np.flatnonzero(root.is_real_row)
+    is_real_column = np.arange(root.size) < num_columns
+
+    def same_choice(column: int) -> "np.ndarray":
+        # Columns meaning the same choice for a row as the given one
+        if column < num_columns:
+            return np.arange(root.size) == column
+        return ~is_real_column
+
+    # Entries: (cost or lower bound, 0 if solved else 1, tie breaker,
+    # solved engine or None, its fixed rows or, for unsolved children,
+    # (parent engine, parent's fixed rows, pairs, t)). Solved entries come
+    # first on ties, so equally good castings are yielded without solving
+    # the children queued with the same bound.
+    queue = [(root.cost(), 0, 0, root, ())]
+    counter = itertools.count(1)
+    while queue:
+        cost, _, _, engine, children_of = heapq.heappop(queue)
+        if engine is None:
+            parent, fixed, pairs, t = children_of
+            child = parent.copy()
+            kept = tuple(row for row, _ in pairs[:t])
+            child.fix_rows(kept)
+            row, column = pairs[t]
+            if child.restrict_row(row, ~same_choice(column)):
+                heapq.heappush(queue, (
+                    child.cost(), 0, next(counter), child, fixed + kept,
+                ))
+            continue
+
+        fixed = children_of
+        columns = engine.columns()
+        yield [
+            (int(row), int(columns[row])) for row in real_rows
+            if columns[row] < num_columns
+        ], -cost
+
+        # Queue the children with a lower bound on their cost increase. The
+        # row must move to another column j (reduced cost r[row, j]) and the
+        # row displaced from j must in turn reach the freed column, directly
+        # or through one more move; rows kept fixed cannot take part.
+        reduced = engine.reduced_costs()
+        row_of_column = np.argsort(columns)
+        off_column = reduced.copy()
+        off_column[np.arange(root.size), columns] = np.inf
+        leave = off_column.min(axis=1)
+        free_rows = np.ones(root.size, dtype=bool)
+        free_rows[list(fixed)] = False
+        pairs = [(int(row), int(columns[row]))
+                 for row in real_rows if free_rows[row]]
+        for t, (row, column) in enumerate(pairs):
+            free_rows[row] = False
+            moves = np.where(same_choice(column), np.inf, reduced[row])
+            if column < num_columns:
+                into = np.where(free_rows, reduced[:, column], np.inf)
+                displaced = row_of_column
+                moves += np.where(
+                    free_rows[displaced],
+                    np.minimum(into[displaced],
+                               leave[displaced] + into.min(initial=np.inf)),
+                    np.inf,
+                )
+            bound = moves.min(initial=np.inf)
+            if bound < np.inf:
+                heapq.heappush(queue, (
+                    cost + bound, 1, next(counter), None,
+                    (engine, fixed, pairs, t),
+                ))
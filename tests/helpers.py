@@ -0,0 +1,104 @@
+"""
+Shared helpers for the tests: small random instances and brute force
+reference answers to check the engines against.
+"""
+
+import itertools
+
+import pytest
+
+from dependencies import scipy_optimize
+from main import LARPAssigner
+
+SEEDS = range(150)
+# Few distinct values, so many cells and many optimal assignments tie
+VALUES = [0, 1, 2, 3, 5, 5, 5, 7.5]
+# Hungarian engines of LARPAssigner; the scipy ones need scipy installed
+ENGINES = ["builtin", pytest.param("scipy", marks=pytest.mark.skipif(
+    not scipy_optimize.is_available(),
+    reason="scipy is not installed",
+))]
+
+
+def random_matrix(rng, max_rows=6, max_columns=6, wide=False):
+    num_rows = rng.randint(1, max_rows)
+    num_columns = rng.randint(num_rows if wide else 1, max_columns)
+    return [[rng.choice(VALUES) for _ in range(num_columns)]
+            for _ in range(num_rows)]
+
+
+def all_matchings(num_rows, num_columns):
+    """Every matching as a column (or -1) per row, as tuples."""
+    for choice in itertools.product(range(-1, num_columns), repeat=num_rows):
+        used = [j for j in choice if j >= 0]
+        if len(used) == len(set(used)):
+            yield choice
+
+
+def brute_force(matrix):
+    """Best total score of a matching (points are never negative)."""
+    num_columns = len(matrix[0])
+    return max(
+        sum(matrix[i][j] for i, j in enumerate(choice) if j >= 0)
+        for choice in all_matchings(len(matrix), num_columns)
+    )
+
+
+def assert_valid(matrix, columns, score):
+    assigned = [j for j in columns if j >= 0]
+    assert len(assigned) == len(set(assigned))
+    total = sum(matrix[i][j] for i, j in enumerate(columns) if j >= 0)
+    assert total == pytest.approx(score)
+
+
+def random_assigner(rng, top_k=False, max_players=6, max_characters=5):
+    num_players = rng.randint(1, max_players)
+    num_characters = rng.randint(1, max_characters)
+    characters = [f"C{j}" for j in range(num_characters)]
+    k = rng.randint(1, num_characters) if top_k else None
+    assigner = LARPAssigner(num_characters, characters, top_k=k)
+    for i in range(num_players):
+        ranking = rng.sample(characters, k or num_characters)
+        assigner.add_player_preferences(f"P{i}", ranking)
+    return assigner
+
+
+def castings(assigner, allowed=None, capacities=None):
+    """Every casting as (player index, character index) pairs."""
+    num_players = len(assigner.players)
+    num_characters = len(assigner.characters)
+    capacities = capacities or [1] * num_characters
+    for choice in itertools.product(range(-1, num_characters),
+                                    repeat=num_players):
+        if any(choice.count(j) > capacities[j] for j in range(num_characters)):
+            continue
+        if allowed is not None and not all(
+                j < 0 or allowed[i][j] for i, j in enumerate(choice)):
+            continue
+        yield [(i, j) for i, j in enumerate(choice) if j >= 0]
+
+
+def total(matrix, pairs):
+    return sum(matrix[i][j] for i, j in pairs)
+
+
+def best_full_casting(assigner, scoring_system, allowed=None):
+    """Best score among castings filling min(players, characters) places."""
+    _, _, matrix = assigner.generate_assignment_matrix(scoring_system)
+    size = min(matrix.shape)
+    scores = [
+        total(matrix, pairs) for pairs in castings(assigner, allowed)
+        if len(pairs) == size
+    ]
+    return max(scores) if scores else None
+
+
+def assert_consistent(assigner, scoring_system, result):
+    assignments, score, details = result[:3]
+    assert len(set(assignments.values())) == len(assignments)
+    expected = sum(
+        assigner.calculate_points(player, character, scoring_system)
+        for player, character in assignments.items()
+    )
+    assert score == pytest.approx(expected)
+    assert len(details) == len(assignments)
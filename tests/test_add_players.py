@@ -0,0 +1,170 @@
+"""Tests for bulk player ingestion with add_players()."""
+
+import random
+
+import numpy as np
+import pytest
+
+from main import LARPAssigner
+
+CHARACTERS = ["Alpha", "Beta", "Gamma"]
+
+
+def assert_same_state(bulk, one_by_one):
+    assert bulk.characters == one_by_one.characters
+    assert list(bulk.players) == list(one_by_one.players)
+    assert dict(bulk.players) == dict(one_by_one.players)
+    assert bulk.get_rank_matrix().tolist() == (
+        one_by_one.get_rank_matrix().tolist())
+
+
+def random_rankings(rng, characters, k, num_players, names):
+    """Rankings under names drawn from names, so some repeat."""
+    return [(rng.choice(names), rng.sample(characters, rng.randint(1, k)
+                                           if k else len(characters)))
+            for _ in range(num_players)]
+
+
+def make_pair(rng, top_k, with_characters):
+    """Two identical assigners, possibly with some players already added."""
+    num_characters = rng.randint(1, 5)
+    characters = [f"C{j}" for j in range(num_characters)]
+    k = rng.randint(1, num_characters) if top_k else None
+    known = characters if with_characters else None
+    assigners = [LARPAssigner(num_characters, known, top_k=k)
+                 for _ in range(2)]
+    existing = random_rankings(rng, characters, k, rng.randint(0, 3),
+                               ["P0", "P1", "P2"])
+    if known is None and k is None:
+        # Without a character list the first ranking added sets it
+        existing = []
+    for assigner in assigners:
+        for name, ranking in existing:
+            assigner.add_player_preferences(name, ranking)
+    return characters, k, assigners
+
+
+@pytest.mark.parametrize("seed", range(100))
+@pytest.mark.parametrize("top_k", [False, True])
+@pytest.mark.parametrize("with_characters", [False, True])
+def test_pairs_match_adding_one_by_one(seed, top_k, with_characters):
+    rng = random.Random(seed)
+    characters, k, (bulk, one_by_one) = make_pair(rng, top_k, with_characters)
+    pairs = random_rankings(rng, characters, k, rng.randint(0, 8),
+                            [f"P{i}" for i in range(6)])
+
+    bulk.add_players(iter(pairs))
+    for name, ranking in pairs:
+        one_by_one.add_player_preferences(name, ranking)
+    assert_same_state(bulk, one_by_one)
+
+
+@pytest.mark.parametrize("seed", range(100))
+@pytest.mark.parametrize("top_k", [False, True])
+def test_arrays_match_adding_one_by_one(seed, top_k):
+    rng = random.Random(seed)
+    characters, k, (bulk, one_by_one) = make_pair(rng, top_k, True)
+    pairs = random_rankings(rng, characters, k, rng.randint(0, 8),
+                            [f"P{i}" for i in range(6)])
+    matrix = np.zeros((len(pairs), len(characters)), dtype=np.int64)
+    for row, (_, ranking) in enumerate(pairs):
+        for rank, character in enumerate(ranking, 1):
+            matrix[row, characters.index(character)] = rank
+
+    bulk.add_players(matrix, [name for name, _ in pairs])
+    for name, ranking in pairs:
+        one_by_one.add_player_preferences(name, ranking)
+    assert_same_state(bulk, one_by_one)
+
+
+def test_repeated_names_keep_the_last_ranking():
+    assigner = LARPAssigner(3, CHARACTERS)
+    assigner.add_players([
+        ("Ann", ["Alpha", "Beta", "Gamma"]),
+        ("Bob", ["Beta", "Alpha", "Gamma"]),
+        ("Ann", ["Gamma", "Beta", "Alpha"]),
+    ])
+    assigner.add_players(np.array([[3, 2, 1], [2, 1, 3]]), ["Cat", "Cat"])
+    assert dict(assigner.players) == {
+        "Ann": ["Gamma", "Beta", "Alpha"],
+        "Bob": ["Beta", "Alpha", "Gamma"],
+        "Cat": ["Beta", "Alpha", "Gamma"],
+    }
+
+
+def test_existing_players_are_replaced_in_place():
+    assigner = LARPAssigner(3, CHARACTERS, top_k=2)
+    assigner.add_player_preferences("Ann", ["Alpha"])
+    assigner.add_player_preferences("Bob", ["Beta", "Gamma"])
+    assigner.add_players([("Ann", ["Gamma", "Beta"]), ("Cat", ["Alpha"])])
+    assert list(assigner.players) == ["Ann", "Bob", "Cat"]
+    assert assigner.get_rank_matrix().tolist() == [
+        [0, 2, 1], [0, 1, 2], [1, 0, 0],
+    ]
+
+
+def dense_assigner():
+    assigner = LARPAssigner(3, CHARACTERS)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta", "Gamma"])
+    return assigner
+
+
+def top_k_assigner():
+    assigner = LARPAssigner(3, top_k=2)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
+    return assigner
+
+
+@pytest.mark.parametrize("make, rankings, names, message", [
+    (dense_assigner, np.array([[1, 2, 3]]), None,
+     "names are required with a rank array"),
+    (lambda: LARPAssigner(3), np.array([[1, 2, 3]]), ["Bob"],
+     "The character list must be set to add a rank array"),
+    (dense_assigner, np.array([[1, 2]]), ["Bob"],
+     r"Rank array must have shape \(1, 3\), got \(1, 2\)"),
+    (dense_assigner, np.array([[1, 2, 3]]), ["Bob", "Cat"],
+     r"Rank array must have shape \(2, 3\), got \(1, 3\)"),
+    (dense_assigner, np.array([[1.0, 2.0, 3.0]]), ["Bob"],
+     "Rank array must hold integers"),
+    (dense_assigner, np.array([[1, 2, 3], [1, 1, 3]]), ["Bob", "Cat"],
+     "Ranks of player Cat must run from 1 to the number of characters they "
+     "rank, each used once"),
+    (dense_assigner, np.array([[1, 2, 4]]), ["Bob"], "Ranks of player Bob"),
+    (dense_assigner, np.array([[-1, 1, 2]]), ["Bob"], "Ranks of player Bob"),
+    (dense_assigner, np.array([[1, 2, 0]]), ["Bob"],
+     "Player Bob must rank all 3 characters, got 2"),
+    (dense_assigner, [("Bob", ["Alpha", "Beta"])], None,
+     "Player Bob must rank all 3 characters, got 2"),
+    (dense_assigner, [("Bob", ["Alpha", "Beta", "Delta"])], None,
+     "Player Bob ranked unknown character 'Delta'"),
+    (dense_assigner, [("Bob", ["Alpha", "Beta", "Alpha"])], None,
+     "Player Bob ranked Alpha twice"),
+    (top_k_assigner, [("Bob", [])], None,
+     "Player Bob must rank 1 to 2 characters, got 0"),
+    (top_k_assigner, [("Bob", ["Alpha", "Beta", "Gamma"])], None,
+     "Player Bob must rank 1 to 2 characters, got 3"),
+    (top_k_assigner, [("Bob", ["Gamma", "Gamma"])], None,
+     "Player Bob ranked Gamma twice"),
+    (top_k_assigner, [("Bob", ["Gamma"]), ("Cat", ["Delta", "Epsilon"])],
+     None, "Rankings name 5 characters, but there are only 3"),
+    (top_k_assigner, np.array([[0, 0]]), ["Bob"],
+     "Player Bob must rank 1 to 2 characters, got 0"),
+    (top_k_assigner, np.array([[1, 3]]), ["Bob"], "Ranks of player Bob"),
+])
+def test_rejected_rankings_leave_the_assigner_unchanged(
+        make, rankings, names, message):
+    assigner = make()
+    before = dict(assigner.players), list(assigner.characters)
+    with pytest.raises(ValueError, match=message):
+        assigner.add_players(rankings, names)
+    assert (dict(assigner.players), assigner.characters) == before
+
+
+def test_a_rejected_batch_stores_no_player():
+    assigner = dense_assigner()
+    with pytest.raises(ValueError, match="Player Eve"):
+        assigner.add_players(
+            [("Bob", ["Beta", "Alpha", "Gamma"])] * 3
+            + [("Eve", ["Beta"])]
+        )
+    assert list(assigner.players) == ["Ann"]
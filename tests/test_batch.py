@@ -0,0 +1,68 @@
+"""Tests for solving many games with solve_batch()."""
+
+import json
+import random
+
+import pytest
+
+from main import load_from_json, solve_batch
+from tests.helpers import random_assigner
+
+
+def games(count, seed=0):
+    rng = random.Random(seed)
+    return [random_assigner(rng, max_players=8, max_characters=8)
+            for _ in range(count)]
+
+
+def expected(game, solver="solve_assignment_hungarian", scoring="linear"):
+    return getattr(game, solver)(scoring)[:3]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_results_follow_input_order(max_workers):
+    batch = games(12)
+    results = solve_batch(batch, "weighted", max_workers=max_workers,
+                          chunksize=3)
+    assert [tuple(result[:3]) for result in results] == [
+        expected(game, scoring="weighted") for game in batch
+    ]
+    assert all(result.solve_time >= 0 for result in results)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_paths_and_assigners_can_be_mixed(tmp_path, max_workers):
+    batch = games(3, seed=1)
+    json_path = tmp_path / "game.json"
+    json_path.write_text(json.dumps({
+        "characters": batch[0].characters,
+        "players": dict(batch[0].players),
+    }))
+    binary_path = str(tmp_path / "game.larp")
+    batch[1].save(binary_path)
+
+    results = solve_batch(
+        [str(json_path), binary_path, batch[2]], max_workers=max_workers
+    )
+    reference = [load_from_json(str(json_path)), batch[1], batch[2]]
+    assert [tuple(result[:3]) for result in results] == [
+        expected(game) for game in reference
+    ]
+    assert results[2].load_time == 0
+
+
+def test_in_process_path_uses_the_given_assigners():
+    batch = games(2, seed=2)
+    results = solve_batch(batch, solver="solve_assignment_with_waitlist",
+                          max_workers=1)
+    assert [tuple(result[:3]) for result in results] == [
+        expected(game, "solve_assignment_with_waitlist") for game in batch
+    ]
+
+
+@pytest.mark.parametrize("solver", [
+    "solve_assignment_k_best", "save", "solve_assignment_simplex",
+])
+def test_solvers_without_a_result_tuple_are_rejected(solver):
+    with pytest.raises(ValueError, match="solver must be one of"):
+        solve_batch(games(1), solver=solver, max_workers=1)
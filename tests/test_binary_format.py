@@ -0,0 +1,121 @@
+"""Tests for the binary assigner format and memory-mapped loading."""
+
+import struct
+
+import numpy as np
+import pytest
+
+from main import LARPAssigner
+
+CHARACTERS = ["Zoë", "Beta", "Gamma", "Delta"]
+
+
+def make_assigner():
+    assigner = LARPAssigner(4, CHARACTERS)
+    assigner.add_player_preferences("Ann", ["Zoë", "Beta", "Gamma", "Delta"])
+    assigner.add_player_preferences("Björn", ["Delta", "Gamma", "Beta", "Zoë"])
+    assigner.add_player_preferences("Cat", ["Beta", "Zoë", "Delta", "Gamma"])
+    assigner.set_character_capacity("Beta", 2)
+    return assigner
+
+
+@pytest.fixture
+def saved(tmp_path):
+    path = str(tmp_path / "game.larp")
+    make_assigner().save(path)
+    return path
+
+
+def test_round_trip(saved):
+    original = make_assigner()
+    loaded = LARPAssigner.load(saved)
+
+    assert loaded.characters == original.characters
+    assert dict(loaded.players) == dict(original.players)
+    assert loaded.capacities == original.capacities
+    assert loaded.get_rank_matrix().tolist() == (
+        original.get_rank_matrix().tolist())
+    assert loaded.solve_assignment_hungarian(engine="builtin") == (
+        original.solve_assignment_hungarian(engine="builtin"))
+
+
+def test_rank_matrix_is_the_mapping(saved):
+    loaded = LARPAssigner.load(saved)
+    matrix = loaded.get_rank_matrix()
+    assert isinstance(matrix, np.memmap)
+    assert not matrix.flags.writeable
+
+
+def test_adding_to_a_loaded_assigner(saved):
+    loaded = LARPAssigner.load(saved)
+    loaded.get_rank_matrix()
+    loaded.add_player_preferences("Dan", ["Gamma", "Delta", "Zoë", "Beta"])
+    loaded.add_players([("Eve", ["Delta", "Zoë", "Beta", "Gamma"])])
+
+    assert list(loaded.players) == ["Ann", "Björn", "Cat", "Dan", "Eve"]
+    assert loaded.players["Dan"] == ["Gamma", "Delta", "Zoë", "Beta"]
+    assert loaded.get_rank_matrix().shape == (5, 4)
+    # The file itself is unchanged
+    assert dict(LARPAssigner.load(saved).players) == (
+        dict(make_assigner().players))
+
+
+def test_removing_from_a_loaded_assigner(saved):
+    loaded = LARPAssigner.load(saved)
+    loaded.remove_player("Björn")
+
+    assert dict(loaded.players) == {
+        "Ann": ["Zoë", "Beta", "Gamma", "Delta"],
+        "Cat": ["Beta", "Zoë", "Delta", "Gamma"],
+    }
+    assert len(LARPAssigner.load(saved).players) == 3
+
+
+def test_saving_a_loaded_assigner(saved, tmp_path):
+    copy = str(tmp_path / "copy.larp")
+    LARPAssigner.load(saved).save(copy)
+    assert dict(LARPAssigner.load(copy).players) == (
+        dict(make_assigner().players))
+
+
+def test_empty_assigner_round_trip(tmp_path):
+    path = str(tmp_path / "empty.larp")
+    LARPAssigner(2, ["Alpha", "Beta"]).save(path)
+    loaded = LARPAssigner.load(path)
+    assert loaded.characters == ["Alpha", "Beta"]
+    assert len(loaded.players) == 0
+
+
+def test_validate_rejects_a_corrupted_file(saved):
+    with open(saved, "r+b") as f:
+        # Give the last player the same rank twice
+        f.seek(-2 * len(CHARACTERS), 2)
+        f.write(np.array([1, 1, 3, 4], dtype="<u2").tobytes())
+
+    # Without validate the file is trusted
+    assert len(LARPAssigner.load(saved).players) == 3
+    with pytest.raises(ValueError, match="Cat"):
+        LARPAssigner.load(saved, validate=True)
+
+
+@pytest.mark.parametrize("data", [b"not an assigner file at all", b"LARP"])
+def test_rejects_other_files(tmp_path, data):
+    path = tmp_path / "other.larp"
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="not a LARP assigner file"):
+        LARPAssigner.load(str(path))
+
+
+def test_rejects_unknown_versions(saved):
+    with open(saved, "r+b") as f:
+        f.seek(8)
+        f.write(struct.pack("<I", 99))
+    with pytest.raises(ValueError, match="version 99"):
+        LARPAssigner.load(saved)
+
+
+def test_top_k_assigners_cannot_be_saved(tmp_path):
+    assigner = LARPAssigner(3, ["Alpha", "Beta", "Gamma"], top_k=1)
+    assigner.add_player_preferences("Ann", ["Alpha"])
+    with pytest.raises(ValueError):
+        assigner.save(str(tmp_path / "top_k.larp"))
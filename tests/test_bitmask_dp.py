@@ -0,0 +1,55 @@
+"""Tests for the subset dynamic programming solver."""
+
+import itertools
+import random
+
+import pytest
+
+from main import LARPAssigner
+from solvers import solve_bitmask_dp
+from tests.helpers import (
+    SEEDS, assert_consistent, assert_valid, best_full_casting, brute_force,
+    random_assigner, random_matrix,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    matrix = random_matrix(rng, wide=True)
+    best = brute_force(matrix)
+
+    columns, score, unique = solve_bitmask_dp(matrix)
+    assert score == pytest.approx(best)
+    assert_valid(matrix, columns, score)
+    optima = [
+        columns for columns in itertools.permutations(
+            range(len(matrix[0])), len(matrix))
+        if sum(matrix[i][j] for i, j in enumerate(columns)) == best
+    ]
+    assert unique == (len(optima) == 1)
+
+
+def test_rejects_tall_matrices():
+    with pytest.raises(ValueError):
+        solve_bitmask_dp([[1], [2]])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_assigner_matches_brute_force(seed):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng)
+
+    assignments, score, details, unique = assigner.solve_assignment_dp(
+        return_unique=True
+    )
+    assert_consistent(assigner, "linear", (assignments, score, details))
+    assert score == pytest.approx(best_full_casting(assigner, "linear"))
+
+
+def test_assigner_rejects_casts_over_the_limit():
+    characters = [f"C{j}" for j in range(23)]
+    assigner = LARPAssigner(len(characters), characters)
+    assigner.add_player_preferences("Ann", characters)
+    with pytest.raises(ValueError, match=">22"):
+        assigner.solve_assignment_dp()
@@ -0,0 +1,67 @@
+"""Tests for the bottleneck solver and Hopcroft-Karp matching."""
+
+import random
+
+import pytest
+
+from main import LARPAssigner
+from solvers import hopcroft_karp
+from tests.helpers import (
+    ENGINES, SEEDS, all_matchings, best_full_casting, castings,
+    random_assigner,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_hopcroft_karp_finds_a_maximum_matching(seed):
+    rng = random.Random(seed)
+    num_rows, num_columns = rng.randint(1, 6), rng.randint(1, 6)
+    adjacency = [[j for j in range(num_columns) if rng.random() < 0.4]
+                 for _ in range(num_rows)]
+    best = max(
+        sum(j >= 0 for j in choice)
+        for choice in all_matchings(num_rows, num_columns)
+        if all(j < 0 or j in adjacency[i] for i, j in enumerate(choice))
+    )
+
+    matching = hopcroft_karp(adjacency, num_columns)
+    assert sum(j >= 0 for j in matching) == best
+    assert all(j < 0 or j in adjacency[i] for i, j in enumerate(matching))
+    matched = [j for j in matching if j >= 0]
+    assert len(matched) == len(set(matched))
+
+    # Warm start from a smaller matching of the same graph
+    partial = [j if i % 2 else -1 for i, j in enumerate(matching)]
+    warm = hopcroft_karp(adjacency, num_columns, partial)
+    assert sum(j >= 0 for j in warm) == best
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigner_minimizes_the_worst_rank(seed, engine):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng)
+    ranks = assigner.get_rank_matrix()
+    size = min(ranks.shape)
+    best_worst = min(
+        max(ranks[i, j] for i, j in pairs)
+        for pairs in castings(assigner) if len(pairs) == size
+    )
+    allowed = (ranks <= best_worst).tolist()
+
+    assignments, score, details, max_rank = (
+        assigner.solve_assignment_bottleneck(engine=engine)
+    )
+    assert max_rank == best_worst
+    assert score == pytest.approx(
+        best_full_casting(assigner, "linear", allowed))
+    assert max(assigner.get_rank(player, character)
+               for player, character in assignments.items()) == best_worst
+
+
+def test_unranked_characters_fail_in_top_k_mode():
+    assigner = LARPAssigner(2, ["Alpha", "Beta"], top_k=1)
+    assigner.add_player_preferences("Ann", ["Alpha"])
+    assigner.add_player_preferences("Bob", ["Alpha"])
+    with pytest.raises(ValueError, match="Not every player"):
+        assigner.solve_assignment_bottleneck()
@@ -0,0 +1,67 @@
+"""Tests for the branch-and-bound solver."""
+
+import random
+
+import pytest
+
+from benchmark import assigner_from_rankings, mallows_rankings
+from solvers import solve_branch_and_bound
+from tests.helpers import (
+    SEEDS, assert_consistent, assert_valid, best_full_casting,
+    brute_force, random_assigner, random_matrix,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    matrix = random_matrix(rng, wide=True)
+
+    columns, score = solve_branch_and_bound(matrix)
+    assert score == pytest.approx(brute_force(matrix))
+    assert_valid(matrix, columns, score)
+    assert min(columns) >= 0
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_handles_negative_points(seed):
+    rng = random.Random(seed)
+    matrix = [[value - 4 for value in row]
+              for row in random_matrix(rng, wide=True)]
+    # Every row must be assigned, so shift back to compare with brute force
+    columns, score = solve_branch_and_bound(matrix)
+    shifted = [[value + 4 for value in row] for row in matrix]
+    assert score + 4 * len(matrix) == pytest.approx(brute_force(shifted))
+    assert_valid(matrix, columns, score)
+
+
+def test_rejects_tall_matrices():
+    with pytest.raises(ValueError):
+        solve_branch_and_bound([[1], [2]])
+
+
+def test_empty_matrix():
+    assert solve_branch_and_bound([]) == ([], 0)
+
+
+@pytest.mark.parametrize("scoring_system", ["linear", "weighted", "exponential"])
+def test_near_unanimous_preferences(scoring_system):
+    # Most cells tie, so a weak bound would search whole plateaus
+    assigner = assigner_from_rankings(mallows_rankings(30, 30, phi=0.3))
+    _, _, matrix = assigner.generate_assignment_matrix(scoring_system)
+    columns, score = solve_branch_and_bound(matrix.tolist())
+
+    reference = assigner.solve_assignment_hungarian(
+        scoring_system, engine="builtin")
+    assert score == pytest.approx(reference[1])
+    assert_valid(matrix.tolist(), columns, score)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_assigner_matches_brute_force(seed):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng)
+
+    result = assigner.solve_assignment_branch_and_bound()
+    assert_consistent(assigner, "linear", result)
+    assert result[1] == pytest.approx(best_full_casting(assigner, "linear"))
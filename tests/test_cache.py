@@ -0,0 +1,79 @@
+"""Tests for the rank and points matrix caches."""
+
+import pytest
+
+from main import SCORING_SYSTEMS, CacheInfo, LARPAssigner, register_scoring_system
+
+CHARACTERS = ["Alpha", "Beta", "Gamma"]
+
+
+def make_assigner():
+    assigner = LARPAssigner(3, CHARACTERS)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta", "Gamma"])
+    assigner.add_player_preferences("Bob", ["Gamma", "Alpha", "Beta"])
+    return assigner
+
+
+def test_readme_example():
+    assigner = make_assigner()
+    assigner.solve_assignment_hungarian("linear")
+    assigner.solve_assignment_branch_and_bound("linear")
+    assigner.solve_assignment_hungarian("weighted")
+    assert assigner.cache_info() == CacheInfo(
+        hits=1, misses=2, rank_hits=1, rank_misses=1)
+
+
+def test_cached_matrices_are_shared_and_read_only():
+    assigner = make_assigner()
+    _, _, first = assigner.generate_assignment_matrix()
+    _, _, second = assigner.generate_assignment_matrix()
+    assert first is second
+    assert assigner.get_rank_matrix() is assigner.get_rank_matrix()
+    with pytest.raises(ValueError):
+        first[0, 0] = 0
+    assert assigner.cache_info() == CacheInfo(
+        hits=1, misses=1, rank_hits=2, rank_misses=1)
+
+
+@pytest.mark.parametrize("change, ranks", [
+    (lambda a: a.add_player_preferences("Cat", ["Beta", "Gamma", "Alpha"]),
+     [[1, 2, 3], [2, 3, 1], [3, 1, 2]]),
+    (lambda a: a.add_player_preferences("Ann", ["Beta", "Gamma", "Alpha"]),
+     [[3, 1, 2], [2, 3, 1]]),
+    (lambda a: a.remove_player("Ann"), [[2, 3, 1]]),
+    (lambda a: a.add_players([("Cat", ["Beta", "Gamma", "Alpha"])]),
+     [[1, 2, 3], [2, 3, 1], [3, 1, 2]]),
+])
+def test_changing_preferences_drops_the_cache(change, ranks):
+    assigner = make_assigner()
+    assigner.generate_assignment_matrix()
+    change(assigner)
+
+    _, _, matrix = assigner.generate_assignment_matrix()
+    assert assigner.get_rank_matrix().tolist() == ranks
+    assert matrix.tolist() == [[4 - rank for rank in row] for row in ranks]
+    assert assigner.cache_info() == CacheInfo(
+        hits=0, misses=2, rank_hits=1, rank_misses=2)
+
+
+def test_clear_cache_keeps_the_counters():
+    assigner = make_assigner()
+    assigner.generate_assignment_matrix()
+    assigner.clear_cache()
+    assigner.generate_assignment_matrix()
+    assert assigner.cache_info() == CacheInfo(
+        hits=0, misses=2, rank_hits=0, rank_misses=2)
+
+
+def test_reregistering_a_scoring_system_rebuilds_its_matrix():
+    assigner = make_assigner()
+    register_scoring_system("test_cache", [10, 5, 1])
+    try:
+        _, _, before = assigner.generate_assignment_matrix("test_cache")
+        register_scoring_system("test_cache", [3, 2, 1])
+        _, _, after = assigner.generate_assignment_matrix("test_cache")
+    finally:
+        del SCORING_SYSTEMS["test_cache"]
+    assert before.tolist() == [[10, 5, 1], [5, 1, 10]]
+    assert after.tolist() == [[3, 2, 1], [2, 1, 3]]
+    assert assigner.cache_info().misses == 2
@@ -0,0 +1,79 @@
+"""Tests for character capacities and the min-cost flow solver."""
+
+import itertools
+import random
+
+import pytest
+
+from main import LARPAssigner
+from solvers import solve_min_cost_flow
+from tests.helpers import SEEDS, VALUES, castings, random_assigner, total
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_solver_matches_brute_force(seed):
+    rng = random.Random(seed)
+    num_rows, num_columns = rng.randint(1, 6), rng.randint(1, 4)
+    matrix = [[rng.choice(VALUES) for _ in range(num_columns)]
+              for _ in range(num_rows)]
+    capacities = [rng.randint(0, 3) for _ in range(num_columns)]
+
+    def feasible(choice):
+        return all(choice.count(j) <= capacities[j] for j in range(num_columns))
+
+    best = max(
+        sum(matrix[i][j] for i, j in enumerate(choice) if j >= 0)
+        for choice in itertools.product(range(-1, num_columns), repeat=num_rows)
+        if feasible(choice)
+    )
+    columns, score = solve_min_cost_flow(matrix, capacities)
+    assert score == pytest.approx(best)
+    assert feasible(list(columns))
+    assert sum(j >= 0 for j in columns) == min(num_rows, sum(capacities))
+    total = sum(matrix[i][j] for i, j in enumerate(columns) if j >= 0)
+    assert total == pytest.approx(score)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_assigner_matches_brute_force(seed):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, max_characters=3)
+    capacities = []
+    for character in assigner.characters:
+        capacities.append(rng.randint(0, 3))
+        assigner.set_character_capacity(character, capacities[-1])
+
+    _, _, matrix = assigner.generate_assignment_matrix("linear")
+    filled = min(len(assigner.players), sum(capacities))
+    best = max(
+        total(matrix, pairs)
+        for pairs in castings(assigner, capacities=capacities)
+        if len(pairs) == filled
+    )
+
+    assignments, score, details = assigner.solve_assignment_min_cost_flow()
+    assert score == pytest.approx(best)
+    assert len(assignments) == filled
+    for character, capacity in zip(assigner.characters, capacities):
+        assert list(assignments.values()).count(character) <= capacity
+
+
+def test_unknown_characters_are_rejected():
+    assigner = LARPAssigner(2, ["Alpha", "Beta"])
+    with pytest.raises(ValueError):
+        assigner.set_character_capacity("Gamma", 2)
+
+
+def test_negative_capacities_are_rejected():
+    assigner = LARPAssigner(2, ["Alpha", "Beta"])
+    with pytest.raises(ValueError):
+        assigner.set_character_capacity("Alpha", -1)
+
+
+def test_capacity_can_be_set_before_the_characters_are_known():
+    assigner = LARPAssigner(2)
+    assigner.set_character_capacity("Alpha", 2)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
+    assigner.add_player_preferences("Bob", ["Alpha", "Beta"])
+    assignments, _, _ = assigner.solve_assignment_min_cost_flow()
+    assert assignments == {"Ann": "Alpha", "Bob": "Alpha"}
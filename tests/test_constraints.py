@@ -0,0 +1,70 @@
+"""Tests for hard rank and forbidden-pair constraints in the solver."""
+
+import random
+
+import pytest
+
+from main import LARPAssigner
+from tests.helpers import (
+    ENGINES, SEEDS, assert_consistent, best_full_casting, random_assigner,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigner_matches_brute_force(seed, engine):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng)
+    max_rank_allowed = rng.randint(1, len(assigner.characters))
+    forbidden = {
+        player: rng.sample(assigner.characters, rng.randint(0, 1))
+        for player in assigner.players
+    }
+
+    ranks = assigner.get_rank_matrix()
+    allowed = ((ranks > 0) & (ranks <= max_rank_allowed)).tolist()
+    for i, player in enumerate(assigner.players):
+        for character in forbidden[player]:
+            allowed[i][assigner.characters.index(character)] = False
+    best = best_full_casting(assigner, "linear", allowed)
+
+    if best is None:
+        with pytest.raises(ValueError):
+            assigner.solve_assignment_hungarian(
+                engine=engine, max_rank_allowed=max_rank_allowed,
+                forbidden=forbidden,
+            )
+        return
+    result = assigner.solve_assignment_hungarian(
+        engine=engine, max_rank_allowed=max_rank_allowed, forbidden=forbidden,
+    )
+    assert_consistent(assigner, "linear", result)
+    assert result[1] == pytest.approx(best)
+    satisfied, _ = assigner.check_satisfaction_constraints(
+        result[0], max_rank_allowed
+    )
+    assert satisfied
+    for player, character in result[0].items():
+        assert character not in forbidden[player]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_infeasible_constraints_name_stranded_players(engine):
+    assigner = LARPAssigner(2, ["Alpha", "Beta"])
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
+    assigner.add_player_preferences("Bob", ["Alpha", "Beta"])
+    with pytest.raises(ValueError, match=r"at most 1 of 2 .*\(Bob have"):
+        assigner.solve_assignment_hungarian(
+            engine=engine, max_rank_allowed=1,
+            forbidden={"Bob": ["Alpha"]},
+        )
+
+
+@pytest.mark.parametrize("forbidden", [
+    {"Cat": ["Alpha"]}, {"Ann": ["Delta"]},
+])
+def test_unknown_names_in_forbidden_are_rejected(forbidden):
+    assigner = LARPAssigner(2, ["Alpha", "Beta"])
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
+    with pytest.raises(ValueError, match="Unknown"):
+        assigner.solve_assignment_hungarian(forbidden=forbidden)
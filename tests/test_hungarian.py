@@ -0,0 +1,49 @@
+"""Tests for the Hungarian engines: scipy's and the pure-Python fallback."""
+
+import random
+
+import pytest
+
+from solvers import solve_shortest_augmenting_path
+from tests.helpers import (
+    ENGINES, SEEDS, assert_consistent, assert_valid, best_full_casting,
+    brute_force, random_assigner, random_matrix,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_shortest_augmenting_path_matches_brute_force(seed):
+    rng = random.Random(seed)
+    matrix = random_matrix(rng, wide=True)
+    best = brute_force(matrix)
+
+    columns, score = solve_shortest_augmenting_path(matrix)
+    assert score == pytest.approx(best)
+    assert_valid(matrix, columns, score)
+    assert min(columns) >= 0
+
+
+def test_shortest_augmenting_path_rejects_tall_matrices():
+    with pytest.raises(ValueError):
+        solve_shortest_augmenting_path([[1], [2]])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigner_matches_brute_force(seed, engine):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng)
+    scoring_system = rng.choice(["linear", "weighted", "borda"])
+
+    result = assigner.solve_assignment_hungarian(scoring_system, engine=engine)
+    assert_consistent(assigner, scoring_system, result)
+    assert result[1] == pytest.approx(
+        best_full_casting(assigner, scoring_system))
+    assert len(result[0]) == min(len(assigner.players),
+                                 len(assigner.characters))
+
+
+def test_assigner_rejects_unknown_engines():
+    assigner = random_assigner(random.Random(0))
+    with pytest.raises(ValueError):
+        assigner.solve_assignment_hungarian(engine="simplex")
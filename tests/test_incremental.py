@@ -0,0 +1,76 @@
+"""Tests for warm-started incremental re-solves."""
+
+import random
+
+import numpy as np
+import pytest
+
+from main import LARPAssigner
+from solvers import IncrementalAssignment
+from tests.helpers import SEEDS, VALUES, assert_consistent, brute_force
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_engine_stays_optimal(seed):
+    rng = random.Random(seed)
+    num_columns = rng.randint(1, 5)
+    rows = {}
+    engine = IncrementalAssignment(np.zeros((0, num_columns)))
+    for _ in range(12):
+        action = rng.random()
+        points = [rng.choice(VALUES) for _ in range(num_columns)]
+        if rows and action < 0.3:
+            engine_row = rng.choice(list(rows))
+            del rows[engine_row]
+            engine.remove_row(engine_row)
+        elif rows and action < 0.6:
+            engine_row = rng.choice(list(rows))
+            rows[engine_row] = points
+            engine.update_row(engine_row, points)
+        else:
+            rows[engine.add_row(points)] = points
+
+        pairs = engine.assignment()
+        assert {row for row, _ in pairs} <= set(rows)
+        assert len({column for _, column in pairs}) == len(pairs)
+        score = sum(rows[row][column] for row, column in pairs)
+        expected = brute_force(list(rows.values())) if rows else 0
+        assert score == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_assigner_follows_every_change(seed):
+    rng = random.Random(seed)
+    characters = [f"C{j}" for j in range(rng.randint(1, 5))]
+    assigner = LARPAssigner(len(characters), characters)
+    for step in range(10):
+        if assigner.players and rng.random() < 0.3:
+            assigner.remove_player(rng.choice(list(assigner.players)))
+        else:
+            player = rng.choice([f"P{i}" for i in range(7)])
+            if player in assigner.players:
+                assigner.remove_player(player)
+            assigner.add_player_preferences(
+                player, rng.sample(characters, len(characters)))
+        if not assigner.players:
+            continue
+
+        result = assigner.solve_assignment_incremental()
+        assert_consistent(assigner, "linear", result)
+        assert result[1] == pytest.approx(
+            assigner.solve_assignment_hungarian(engine="builtin")[1])
+
+
+def test_assigner_reports_players_not_characters_by_engine_row():
+    # Engine rows follow sign-up order; results must not depend on it
+    assigner = LARPAssigner(3, ["Alpha", "Beta", "Gamma"])
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta", "Gamma"])
+    assigner.add_player_preferences("Bob", ["Beta", "Alpha", "Gamma"])
+    assigner.solve_assignment_incremental()
+    assigner.remove_player("Ann")
+    assigner.add_player_preferences("Ann", ["Gamma", "Beta", "Alpha"])
+
+    assignments, score, details = assigner.solve_assignment_incremental()
+    assert assignments == {"Bob": "Beta", "Ann": "Gamma"}
+    assert score == 6
+    assert sorted(details) == [("Ann", "Gamma", 3, 1), ("Bob", "Beta", 3, 1)]
@@ -0,0 +1,189 @@
+"""Tests for the opt-in timing and call counters."""
+
+import json
+import pickle
+import time
+
+import pytest
+
+from instrumentation import Stats
+from main import LARPAssigner, solve_batch
+
+CHARACTERS = ["Alpha", "Beta", "Gamma"]
+
+
+def make_assigner():
+    assigner = LARPAssigner(3, CHARACTERS)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta", "Gamma"])
+    assigner.add_player_preferences("Bob", ["Gamma", "Alpha", "Beta"])
+    assigner.add_player_preferences("Cat", ["Alpha", "Gamma", "Beta"])
+    return assigner
+
+
+def test_phase_totals():
+    stats = Stats()
+    for _ in range(3):
+        with stats.phase("sleep"):
+            time.sleep(0.01)
+    with pytest.raises(KeyError):
+        with stats.phase("fail"):
+            raise KeyError
+
+    assert stats.phases["sleep"].calls == 3
+    assert stats.phases["sleep"].wall_time >= 0.03
+    assert stats.phases["sleep"].cpu_time < stats.phases["sleep"].wall_time
+    assert stats.phases["fail"].calls == 1
+
+
+def test_counter_totals():
+    stats = Stats()
+    counted = stats.counted(lambda x: x + 1, "increment")
+    assert [counted(i) for i in range(4)] == [1, 2, 3, 4]
+    stats.count("increment")
+    stats.count("other")
+    assert stats.counters == {"increment": 5, "other": 1}
+
+    stats.reset()
+    counted(0)
+    assert stats.counters == {"increment": 1}
+    assert stats.phases == {}
+
+
+def test_instrumented_assigner_records_phases_and_counts():
+    assigner = make_assigner()
+    stats = assigner.enable_instrumentation()
+    assert assigner.stats is stats
+
+    assigner.add_player_preferences("Dan", ["Beta", "Alpha", "Gamma"])
+    assigner.solve_assignment_hungarian("linear")
+    assigner.solve_assignment_hungarian("linear")
+    # The solver builds its details with get_rank
+    solver_calls = stats.counters["get_rank"]
+    for player in ["Ann", "Bob"]:
+        assigner.get_rank(player, "Beta")
+
+    assert stats.counters["add_player_preferences"] == 1
+    assert stats.counters["get_rank"] == solver_calls + 2
+    assert stats.phases["solve_assignment_hungarian"].calls == 2
+    # Nested phases are recorded too, and inclusive in their callers
+    assert stats.phases["generate_assignment_matrix"].calls == 2
+    assert (stats.phases["generate_assignment_matrix"].wall_time
+            <= stats.phases["solve_assignment_hungarian"].wall_time)
+
+
+def test_disable_instrumentation_restores_the_plain_methods():
+    assigner = make_assigner()
+    plain = assigner.solve_assignment_hungarian("linear")
+    stats = assigner.enable_instrumentation()
+    assert "solve_assignment_hungarian" in vars(assigner)
+    assert assigner.solve_assignment_hungarian("linear") == plain
+
+    counters = dict(stats.counters)
+    assigner.disable_instrumentation()
+    assert assigner.stats is None
+    for name in (LARPAssigner._TIMED_METHODS
+                 + LARPAssigner._COUNTED_METHODS):
+        assert name not in vars(assigner)
+        assert getattr(assigner, name).__func__ is getattr(LARPAssigner, name)
+
+    assigner.solve_assignment_hungarian("linear")
+    assigner.get_rank("Ann", "Alpha")
+    assert stats.phases["solve_assignment_hungarian"].calls == 1
+    assert stats.counters == counters
+
+
+def test_enabling_twice_does_not_double_wrap():
+    assigner = make_assigner()
+    first = assigner.enable_instrumentation()
+    second = assigner.enable_instrumentation()
+    assigner.get_rank("Ann", "Alpha")
+    assert second.counters == {"get_rank": 1}
+    assert first.counters == {}
+
+
+def test_shared_stats_across_assigners():
+    stats = Stats()
+    for _ in range(2):
+        assigner = make_assigner()
+        assigner.enable_instrumentation(stats)
+        assigner.solve_assignment_hungarian("linear")
+    assert stats.phases["solve_assignment_hungarian"].calls == 2
+
+
+def test_instrumented_assigner_pickles_without_the_wrappers():
+    assigner = make_assigner()
+    assigner.enable_instrumentation()
+    assigner.get_rank_matrix()
+
+    copy = pickle.loads(pickle.dumps(assigner))
+    assert copy.stats is None
+    assert not set(vars(copy)) & set(LARPAssigner._TIMED_METHODS
+                                      + LARPAssigner._COUNTED_METHODS)
+    assert copy.solve_assignment_hungarian("linear") == (
+        make_assigner().solve_assignment_hungarian("linear"))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_instrumented_assigners_in_solve_batch(max_workers):
+    games = [make_assigner(), make_assigner()]
+    stats = Stats()
+    for game in games:
+        game.enable_instrumentation(stats)
+
+    results = solve_batch(games, max_workers=max_workers)
+    expected = make_assigner().solve_assignment_hungarian("linear")
+    assert [result[:3] for result in results] == [expected] * 2
+    # Solved in this process the games record into stats; workers get
+    # pickled copies without the wrappers
+    solves = stats.phases.get("solve_assignment_hungarian")
+    assert (solves.calls if solves else 0) == (2 if max_workers == 1 else 0)
+    # The games themselves stay instrumented
+    games[0].solve_assignment_hungarian("linear")
+    assert stats.phases["solve_assignment_hungarian"].calls == (
+        3 if max_workers == 1 else 1)
+
+
+def test_chrome_trace_shape(tmp_path):
+    assigner = make_assigner()
+    stats = assigner.enable_instrumentation()
+    assigner.solve_assignment_hungarian("linear")
+    assigner.get_rank("Ann", "Alpha")
+
+    trace = stats.to_chrome_trace()
+    assert trace["displayTimeUnit"] == "ms"
+    *phases, counter = trace["traceEvents"]
+    assert {event["name"] for event in phases} == {
+        "solve_assignment_hungarian", "generate_assignment_matrix",
+        "get_rank_matrix",
+    }
+    for event in phases:
+        assert event["ph"] == "X"
+        assert set(event) == {"name", "ph", "pid", "tid", "ts", "dur", "args"}
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        assert set(event["args"]) == {"cpu_ms"}
+    # The solver's event encloses the matrix build it triggered
+    solve = next(e for e in phases
+                 if e["name"] == "solve_assignment_hungarian")
+    build = next(e for e in phases
+                 if e["name"] == "generate_assignment_matrix")
+    assert solve["ts"] <= build["ts"]
+    assert build["ts"] + build["dur"] <= solve["ts"] + solve["dur"]
+
+    assert counter["ph"] == "C"
+    assert counter["name"] == "calls"
+    assert counter["args"] == stats.counters
+    assert counter["ts"] == max(e["ts"] + e["dur"] for e in phases)
+
+    path = tmp_path / "trace.json"
+    stats.save_chrome_trace(str(path))
+    assert json.loads(path.read_text()) == trace
+
+
+def test_chrome_trace_without_counters():
+    stats = Stats()
+    assert stats.to_chrome_trace() == {
+        "traceEvents": [], "displayTimeUnit": "ms",
+    }
+    with stats.phase("only"):
+        pass
+    assert [e["ph"] for e in stats.to_chrome_trace()["traceEvents"]] == ["X"]
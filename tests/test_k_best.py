@@ -0,0 +1,64 @@
+"""Tests for enumerating the k best assignments with Murty's algorithm."""
+
+import itertools
+import random
+
+import pytest
+
+from solvers import k_best_assignments
+from tests.helpers import castings, random_assigner, random_matrix, total
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_engine_enumerates_every_assignment_in_order(seed):
+    rng = random.Random(seed)
+    matrix = random_matrix(rng, max_rows=4, max_columns=4)
+    num_rows, num_columns = len(matrix), len(matrix[0])
+    # Every way of filling min(rows, columns) pairs
+    if num_rows <= num_columns:
+        expected = [
+            frozenset(enumerate(columns)) for columns in
+            itertools.permutations(range(num_columns), num_rows)
+        ]
+    else:
+        expected = [
+            frozenset((i, j) for j, i in enumerate(rows)) for rows in
+            itertools.permutations(range(num_rows), num_columns)
+        ]
+
+    solutions = list(k_best_assignments(matrix))
+    found = [frozenset(pairs) for pairs, _ in solutions]
+    assert sorted(map(sorted, found)) == sorted(map(sorted, expected))
+    scores = [score for _, score in solutions]
+    assert scores == sorted(scores, reverse=True)
+    for pairs, score in solutions:
+        assert sum(matrix[i][j] for i, j in pairs) == pytest.approx(score)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_assigner_yields_every_casting_best_first(seed):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, max_players=4, max_characters=4)
+    _, _, matrix = assigner.generate_assignment_matrix("linear")
+    size = min(matrix.shape)
+    expected = sorted(
+        (total(matrix, pairs) for pairs in castings(assigner)
+         if len(pairs) == size),
+        reverse=True,
+    )
+
+    results = list(assigner.solve_assignment_k_best())
+    scores = [score for _, score, _ in results]
+    assert scores == pytest.approx(expected)
+    assert len({frozenset(assignments.items())
+                for assignments, _, _ in results}) == len(results)
+    assert [score for _, score, _ in assigner.solve_assignment_k_best(k=3)] \
+        == pytest.approx(expected[:3])
+
+
+def test_castings_are_produced_lazily():
+    matrix = [[float(i * j % 7) for j in range(9)] for i in range(9)]
+    solutions = k_best_assignments(matrix)
+    scores = [score for _, score in itertools.islice(solutions, 5)]
+    assert scores == sorted(scores, reverse=True)
+    assert len(scores) == 5
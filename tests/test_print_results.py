@@ -0,0 +1,143 @@
+"""Tests for the formatted results report."""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+from main import LARPAssigner, _REPORT_CHUNK_LINES
+from tests.helpers import random_assigner
+
+EXPECTED_TOP_K = """
+============================================================
+OPTIMAL LARP CHARACTER ASSIGNMENT
+============================================================
+Scoring System: Linear
+Total Satisfaction Score: 6
+Average Score per Player: 2.0
+
+Player          Character       Rank   Points
+--------------------------------------------------
+Ann             Alpha           #1     3
+Cat             Beta            #1     3
+Bob             Gamma           #-     0
+
+Rank Distribution:
+  Rank #1: 2 players
+  Unranked: 1 players
+
+First choice assignments: 2
+Top 3 choice assignments: 2
+"""
+
+
+def baseline_report(num_characters, assignments, total_score, details,
+                    scoring_system="linear"):
+    """The report as the original print-per-line implementation wrote it."""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        print(f"\n{'=' * 60}")
+        print(f"OPTIMAL LARP CHARACTER ASSIGNMENT")
+        print(f"{'=' * 60}")
+        print(f"Scoring System: {scoring_system.title()}")
+        print(f"Total Satisfaction Score: {total_score}")
+        print(f"Average Score per Player: {total_score / len(assignments):.1f}")
+
+        print(f"\n{'Player':<15} {'Character':<15} {'Rank':<6} {'Points':<8}")
+        print("-" * 50)
+        for player, character, points, rank in sorted(details,
+                                                      key=lambda x: x[3]):
+            print(f"{player:<15} {character:<15} #{rank:<5} {points:<8}")
+
+        ranks = [detail[3] for detail in details]
+        rank_counts = {}
+        for i in range(1, num_characters + 1):
+            rank_counts[i] = ranks.count(i)
+        print(f"\n{'Rank Distribution:'}")
+        for rank, count in rank_counts.items():
+            if count > 0:
+                print(f"  Rank #{rank}: {count} players")
+        print(f"\nFirst choice assignments: {rank_counts[1]}")
+        print(f"Top 3 choice assignments: "
+              f"{sum(rank_counts[i] for i in [1, 2, 3])}")
+    return out.getvalue()
+
+
+def make_top_k_assigner():
+    """Bob's only choice is taken, so he is cast outside his top 1."""
+    assigner = LARPAssigner(3, ["Alpha", "Beta", "Gamma"], top_k=1)
+    assigner.add_player_preferences("Ann", ["Alpha"])
+    assigner.add_player_preferences("Bob", ["Alpha"])
+    assigner.add_player_preferences("Cat", ["Beta"])
+    return assigner
+
+
+def strip_lines(text):
+    return "\n".join(line.rstrip() for line in text.split("\n"))
+
+
+class RecordingFile(io.StringIO):
+    """A text file that remembers each write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_report_matches_the_baseline_format(seed, capsys):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, max_players=6, max_characters=6)
+    while assigner.num_characters < 3 or not assigner.players:
+        assigner = random_assigner(rng, max_players=6, max_characters=6)
+    scoring_system = rng.choice(["linear", "weighted"])
+    result = assigner.solve_assignment_hungarian(scoring_system)
+
+    assigner.print_results(*result, scoring_system)
+    assert capsys.readouterr().out == baseline_report(
+        assigner.num_characters, *result, scoring_system)
+
+
+def test_unranked_assignments_are_shown_last(capsys):
+    assigner = make_top_k_assigner()
+    result = assigner.solve_assignment_hungarian("linear")
+    assert ("Bob", "Gamma", 0, None) in result[2]
+
+    assigner.print_results(*result)
+    assert strip_lines(capsys.readouterr().out) == EXPECTED_TOP_K
+
+
+def test_report_is_written_to_file(capsys):
+    assigner = make_top_k_assigner()
+    out = io.StringIO()
+
+    assigner.print_results(*assigner.solve_assignment_hungarian("linear"),
+                           file=out)
+    assert strip_lines(out.getvalue()) == EXPECTED_TOP_K
+    assert capsys.readouterr().out == ""
+
+
+def test_large_reports_are_written_in_chunks():
+    num_characters = 5
+    assigner = LARPAssigner(num_characters)
+    rng = random.Random(0)
+    details = []
+    for i in range(3 * _REPORT_CHUNK_LINES):
+        rank = rng.randint(1, num_characters)
+        details.append((f"P{i}", f"C{i}", num_characters + 1 - rank, rank))
+    assignments = {player: character for player, character, _, _ in details}
+    total_score = sum(points for _, _, points, _ in details)
+    out = RecordingFile()
+
+    assigner.print_results(assignments, total_score, details, file=out)
+    assert out.getvalue() == baseline_report(
+        num_characters, assignments, total_score, details)
+    assert len(out.writes) == 4
+    assert all(text.endswith("\n") for text in out.writes)
+    assert all(text.count("\n") <= _REPORT_CHUNK_LINES + 10
+               for text in out.writes)
@@ -0,0 +1,61 @@
+"""Tests for rank-maximal matching."""
+
+import random
+
+import pytest
+
+from solvers import solve_rank_maximal
+from tests.helpers import SEEDS, all_matchings, castings, random_assigner
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_engine_matches_brute_force(seed):
+    rng = random.Random(seed)
+    num_rows, num_columns = rng.randint(1, 5), rng.randint(1, 5)
+    choices = []
+    for _ in range(num_rows):
+        ranked = rng.sample(range(num_columns), rng.randint(1, num_columns))
+        # Some ranks are left without a column
+        choices.append([j if rng.random() < 0.8 else -1 for j in ranked])
+
+    def signature(matching):
+        counts = [0] * num_columns
+        for row, column in enumerate(matching):
+            if column >= 0:
+                counts[choices[row].index(column)] += 1
+        return counts
+
+    best = max(
+        signature(choice)
+        for choice in all_matchings(num_rows, num_columns)
+        if all(j < 0 or j in choices[i] for i, j in enumerate(choice))
+    )
+    matching = solve_rank_maximal(choices, num_columns)
+    assert all(j < 0 or j in choices[i] for i, j in enumerate(matching))
+    matched = [j for j in matching if j >= 0]
+    assert len(matched) == len(set(matched))
+    assert signature(matching) == best
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_assigner_matches_brute_force(seed):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, top_k=rng.random() < 0.5)
+    ranks = assigner.get_rank_matrix()
+
+    def signature(pairs):
+        counts = [0] * len(assigner.characters)
+        for i, j in pairs:
+            counts[ranks[i, j] - 1] += 1
+        return counts
+
+    allowed = (ranks > 0).tolist()
+    best = max(signature(pairs) for pairs in castings(assigner, allowed))
+    assignments, _, details = assigner.solve_assignment_rank_maximal()
+    players = list(assigner.players)
+    pairs = [
+        (players.index(player), assigner.characters.index(character))
+        for player, character in assignments.items()
+    ]
+    assert signature(pairs) == best
+    assert all(rank is not None for _, _, _, rank in details)
@@ -0,0 +1,80 @@
+"""Tests for the interned, columnar rank storage."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from main import LARPAssigner
+
+CHARACTERS = ["Alpha", "Beta", "Gamma"]
+
+
+def make_assigner():
+    assigner = LARPAssigner(3, CHARACTERS)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta", "Gamma"])
+    assigner.add_player_preferences("Bob", ["Gamma", "Alpha", "Beta"])
+    return assigner
+
+
+def test_rank_matrix_is_a_read_only_view_of_the_storage():
+    assigner = make_assigner()
+    matrix = assigner.get_rank_matrix()
+
+    assert matrix.dtype == np.uint16
+    assert matrix.tolist() == [[1, 2, 3], [2, 3, 1]]
+    assert np.shares_memory(matrix, np.frombuffer(assigner._ranks, np.uint16))
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 2
+
+
+def test_changes_while_a_rank_matrix_is_held():
+    assigner = make_assigner()
+    held = assigner.get_rank_matrix()
+
+    assigner.add_player_preferences("Cat", ["Beta", "Gamma", "Alpha"])
+    assigner.remove_player("Ann")
+    assigner.add_players([("Dan", ["Alpha", "Gamma", "Beta"])])
+
+    assert held.tolist() == [[1, 2, 3], [2, 3, 1]]
+    assert assigner.get_rank_matrix().tolist() == [
+        [2, 3, 1], [3, 1, 2], [1, 3, 2],
+    ]
+
+
+def test_players_view_reads_the_rank_storage():
+    assigner = make_assigner()
+    assert dict(assigner.players) == {
+        "Ann": ["Alpha", "Beta", "Gamma"],
+        "Bob": ["Gamma", "Alpha", "Beta"],
+    }
+    assert "Ann" in assigner.players and "Cat" not in assigner.players
+    assert assigner.get_rank("Bob", "Beta") == 3
+    assert assigner.get_rank("Bob", "Delta") is None
+
+
+def test_top_k_rank_matrix_is_unsigned():
+    assigner = LARPAssigner(3, CHARACTERS, top_k=2)
+    assigner.add_player_preferences("Ann", ["Gamma", "Alpha"])
+    matrix = assigner.get_rank_matrix()
+    assert matrix.dtype == np.uint16
+    assert matrix.tolist() == [[2, 0, 1]]
+
+
+def test_pickled_assigner_with_a_cached_rank_matrix():
+    assigner = make_assigner()
+    assigner.get_rank_matrix()
+    copy = pickle.loads(pickle.dumps(assigner))
+    copy.add_player_preferences("Cat", ["Beta", "Gamma", "Alpha"])
+    assert copy.get_rank_matrix().tolist() == [
+        [1, 2, 3], [2, 3, 1], [3, 1, 2],
+    ]
+
+
+def test_rank_matrix_can_be_added_back():
+    assigner = make_assigner()
+    other = LARPAssigner(3, CHARACTERS)
+    other.add_players(assigner.get_rank_matrix(), ["Ann", "Bob"])
+    assigner.add_players(assigner.get_rank_matrix(), ["Cat", "Dan"])
+    assert dict(other.players) == dict(make_assigner().players)
+    assert assigner.get_rank_matrix().tolist() == [[1, 2, 3], [2, 3, 1]] * 2
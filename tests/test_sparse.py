@@ -0,0 +1,96 @@
+"""Tests for top-k preference mode and the sparse assignment solvers."""
+
+import random
+
+import pytest
+
+from main import LARPAssigner
+from solvers import solve_sparse_shortest_augmenting_path
+from tests.helpers import (
+    ENGINES, SEEDS, all_matchings, assert_consistent, assert_valid,
+    best_full_casting, random_assigner, random_matrix,
+)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_sparse_shortest_augmenting_path_matches_brute_force(seed):
+    rng = random.Random(seed)
+    matrix = random_matrix(rng, wide=True)
+    allowed = [[rng.random() < 0.6 for _ in row] for row in matrix]
+    indptr, columns, weights = [0], [], []
+    for row, mask in zip(matrix, allowed):
+        for j, ok in enumerate(mask):
+            if ok:
+                columns.append(j)
+                weights.append(row[j])
+        indptr.append(len(columns))
+
+    complete = [
+        choice for choice in all_matchings(len(matrix), len(matrix[0]))
+        if all(j >= 0 and allowed[i][j] for i, j in enumerate(choice))
+    ]
+    if not complete:
+        with pytest.raises(ValueError):
+            solve_sparse_shortest_augmenting_path(
+                indptr, columns, weights, len(matrix[0]))
+        return
+
+    best = max(sum(matrix[i][j] for i, j in enumerate(choice))
+               for choice in complete)
+    assigned, score = solve_sparse_shortest_augmenting_path(
+        indptr, columns, weights, len(matrix[0]))
+    assert score == pytest.approx(best)
+    assert_valid(matrix, assigned, score)
+    assert all(allowed[i][j] for i, j in enumerate(assigned))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_assigner_matches_brute_force(seed, engine):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, top_k=True)
+    ranks = assigner.get_rank_matrix()
+    allowed = (ranks > 0).tolist()
+    best = best_full_casting(assigner, "linear", allowed)
+
+    if best is None:
+        with pytest.raises(ValueError):
+            assigner.solve_assignment_sparse(engine=engine)
+        return
+    result = assigner.solve_assignment_sparse(engine=engine)
+    assert_consistent(assigner, "linear", result)
+    assert result[1] == pytest.approx(best)
+    assert all(
+        assigner.get_rank(player, character) is not None
+        for player, character in result[0].items()
+    )
+
+
+def test_unranked_character_fails_the_rank_constraint_in_top_k_mode():
+    assigner = LARPAssigner(3, ["Alpha", "Beta", "Gamma"], top_k=1)
+    assigner.add_player_preferences("Ann", ["Alpha"])
+    satisfied, unsatisfied = assigner.check_satisfaction_constraints(
+        {"Ann": "Gamma"}, max_rank_allowed=2
+    )
+    assert not satisfied
+    assert unsatisfied == ["Ann got an unranked character (Gamma)"]
+
+
+def test_top_k_rankings_are_stored_sparsely():
+    assigner = LARPAssigner(4, top_k=2)
+    assigner.add_player_preferences("Ann", ["Gamma", "Alpha"])
+    assigner.add_player_preferences("Bob", ["Beta"])
+
+    assert assigner.players["Ann"] == ["Gamma", "Alpha"]
+    assert assigner.players["Bob"] == ["Beta"]
+    assert assigner.get_rank("Ann", "Alpha") == 2
+    assert assigner.get_rank("Bob", "Alpha") is None
+    indptr, columns, ranks = assigner.get_sparse_rank_matrix()
+    assert indptr.tolist() == [0, 2, 3]
+    assert ranks.tolist() == [1, 2, 1]
+
+
+def test_top_k_rejects_longer_rankings():
+    assigner = LARPAssigner(3, ["Alpha", "Beta", "Gamma"], top_k=1)
+    with pytest.raises(ValueError, match="must rank 1 to 1 characters"):
+        assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
@@ -0,0 +1,133 @@
+"""Tests for the streaming JSON loader."""
+
+import io
+import json
+
+import pytest
+
+from main import _JSONStream, load_from_json, stream_from_json
+
+CHARACTERS = ["Zoë", "Ærin", "龍王", "🐉 Drake", 'Quote "Q"', "Back\\slash"]
+DOCUMENT = {
+    "weight": 12.5,
+    "scale": 1e5,
+    "offset": -0.25E-3,
+    "characters": CHARACTERS,
+    "meta": {"note": "é😀 \n", "flags": [True, False, None]},
+    "players": {
+        "Ann": CHARACTERS,
+        "Björn": CHARACTERS[::-1],
+        "🎭": CHARACTERS[2:] + CHARACTERS[:2],
+    },
+    "capacities": {"Zoë": 2},
+}
+
+
+def write(tmp_path, text, name="game.json"):
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def assert_same(streamed, loaded):
+    assert streamed.characters == loaded.characters
+    assert dict(streamed.players) == dict(loaded.players)
+    assert streamed.capacities == loaded.capacities
+
+
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_every_chunk_size_reads_the_same_document(tmp_path, ensure_ascii):
+    # Every chunk size splits strings, escapes, numbers and multi-byte
+    # UTF-8 sequences at different places
+    text = json.dumps(DOCUMENT, ensure_ascii=ensure_ascii)
+    path = write(tmp_path, text)
+    expected = load_from_json(path)
+    for chunk_size in range(1, len(text.encode("utf-8")) + 1):
+        assert_same(stream_from_json(path, chunk_size=chunk_size), expected)
+
+
+@pytest.mark.parametrize("number", ["12.5", "1e5", "-0.25E-3", "7E+2"])
+def test_number_split_at_the_default_chunk_size(tmp_path, number):
+    prefix = '{"characters": ["A"], "weight": '
+    # Pad so that the first chunk ends with the number's "." or "e"
+    cut = next(i for i, char in enumerate(number) if char in ".eE")
+    padding = " " * ((1 << 16) - 1 - len(prefix) - cut)
+    text = prefix + padding + number + ', "players": {"Ann": ["A"]}}'
+    path = write(tmp_path, text)
+    assert text.encode("utf-8")[(1 << 16) - 1] == ord(number[cut])
+    assert dict(stream_from_json(path).players) == {"Ann": ["A"]}
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"characters": ["A",, "B"], "players": {}}', "Expecting value"),
+    ('{"characters": ["A"] "players": {}}', "expected ',' or '}'"),
+    ('{"characters": ["A"], "players": {}} x', "extra data"),
+    ('{"characters": ["A"], "players": {}}{}', "extra data"),
+    ('{"characters": ["A"], "players": {},}', "Expecting value"),
+    ('{1: ["A"]}', "object keys must be strings"),
+    ('{"characters" ["A"]}', "expected ':'"),
+    ('{"characters": ["A"], "players": {"Ann": ["A"]}',
+     "expected ',' or '}'"),
+    ('{"characters": ["A"], "players": {"Ann" ["A"]}}', "expected ':'"),
+    ('{"characters": ["A"], "weight": 12.}', "expected ',' or '}'"),
+    ('{"characters": ["A"], "players": {"Ann": ["A\\x"]}}', "Invalid"),
+    ('{"characters": ["A"], "players": {"Ann": ["A]}}', "Unterminated"),
+    ('["A"]', "expected '{'"),
+    ('', "expected '{'"),
+])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_malformed_json_is_rejected(tmp_path, text, message, chunk_size):
+    path = write(tmp_path, text)
+    with pytest.raises(ValueError, match=message):
+        stream_from_json(path, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"characters": "A", "players": {}}', '"characters" must be a list'),
+    ('{"characters": ["A"], "players": {"Ann": "A"}}', "must be a list"),
+    ('{"players": {"Ann": ["A"]}, "characters": ["A"]}',
+     '"characters" must come before "players"'),
+    ('{"capacities": {}}', 'no "characters" list'),
+    ('{"characters": ["A", "B"], "players": {"Ann": ["A", "A"]}}',
+     "ranked A twice"),
+])
+def test_invalid_documents_are_rejected(tmp_path, text, message):
+    path = write(tmp_path, text)
+    with pytest.raises(ValueError, match=message):
+        stream_from_json(path, chunk_size=3)
+
+
+def test_errors_report_the_offset_in_the_file(tmp_path):
+    text = '{"characters": ["A"],' + " " * 5000 + '"players": {"Ann": ["A",,]}}'
+    path = write(tmp_path, text)
+    with pytest.raises(ValueError, match=rf"\(char {text.index(',,') + 1}\)"):
+        stream_from_json(path, chunk_size=64)
+
+
+def test_malformed_json_is_not_read_to_the_end():
+    ranking = json.dumps(["A", "B"])
+    data = (
+        '{"characters": ["A", "B"], "players": {"Ann": ["A",, "B"], '
+        + ", ".join(f'"P{i}": {ranking}' for i in range(50000))
+        + "}}"
+    ).encode("utf-8")
+    stream = _JSONStream(io.BytesIO(data), 1024)
+    with pytest.raises(ValueError, match="Expecting value"):
+        for key in stream.members():
+            if key == "players":
+                for _ in stream.members():
+                    stream.value()
+            else:
+                stream.value()
+    assert stream.bytes_read <= 4096 < len(data)
+
+
+def test_progress_is_reported(tmp_path):
+    players = {f"P{i}": ["A", "B"] for i in range(10)}
+    path = write(tmp_path, json.dumps(
+        {"characters": ["A", "B"], "players": players}))
+    calls = []
+    stream_from_json(path, progress=lambda *args: calls.append(args),
+                     progress_every=4, chunk_size=16)
+    assert [loaded for loaded, _, _ in calls] == [4, 8, 10]
+    assert calls[-1][1] == calls[-1][2]
@@ -0,0 +1,155 @@
+"""Tests for checking stored rankings with validate_rankings()."""
+
+import random
+
+import numpy as np
+import pytest
+
+from main import LARPAssigner, _invalid_rank_rows
+
+CHARACTERS = ["Alpha", "Beta", "Gamma"]
+
+
+def runs_from_one(row):
+    """Whether a row's nonzero ranks are 1..count, each used once."""
+    ranks = sorted(rank for rank in row if rank != 0)
+    return ranks == list(range(1, len(ranks) + 1))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_invalid_rank_rows_matches_a_direct_check(seed):
+    rng = random.Random(seed)
+    num_columns = rng.randint(1, 6)
+    rows = []
+    for _ in range(rng.randint(0, 8)):
+        if rng.random() < 0.5:
+            # A valid row, ranking some of the columns
+            count = rng.randint(0, num_columns)
+            row = list(range(1, count + 1)) + [0] * (num_columns - count)
+            rng.shuffle(row)
+        else:
+            row = [rng.randint(-2, num_columns + 1) for _ in range(num_columns)]
+        rows.append(row)
+    matrix = np.array(rows, dtype=np.int64).reshape(len(rows), num_columns)
+
+    expected = [i for i, row in enumerate(rows) if not runs_from_one(row)]
+    assert _invalid_rank_rows(matrix).tolist() == expected
+
+
+@pytest.mark.parametrize("row, valid", [
+    ([1, 2, 3], True),
+    ([2, 0, 1], True),
+    ([0, 0, 0], True),
+    ([1, 1, 2], False),   # duplicate
+    ([1, 2, 4], False),   # out of range
+    ([0, 0, 2], False),   # gap: rank 1 missing
+    ([-1, 1, 2], False),  # negative
+    ([-1, 0, 0], False),
+])
+def test_invalid_rank_rows_cases(row, valid):
+    matrix = np.array([[1, 2, 3], row, [3, 2, 1]])
+    assert _invalid_rank_rows(matrix).tolist() == ([] if valid else [1])
+    assert _invalid_rank_rows(matrix.astype(np.int32)).tolist() == (
+        [] if valid else [1])
+
+
+def test_invalid_rank_rows_of_unsigned_arrays():
+    matrix = np.array([[1, 2, 3], [1, 1, 65535]], dtype=np.uint16)
+    assert _invalid_rank_rows(matrix).tolist() == [1]
+    assert _invalid_rank_rows(np.zeros((0, 3), dtype=np.uint16)).size == 0
+
+
+def make_assigner(num_players=3):
+    assigner = LARPAssigner(3, CHARACTERS)
+    for i in range(num_players):
+        assigner.add_player_preferences(f"P{i}", CHARACTERS[i % 3:]
+                                        + CHARACTERS[:i % 3])
+    return assigner
+
+
+def make_top_k_assigner():
+    assigner = LARPAssigner(3, CHARACTERS, top_k=2)
+    assigner.add_player_preferences("Ann", ["Alpha", "Beta"])
+    assigner.add_player_preferences("Bob", ["Gamma"])
+    assigner.add_player_preferences("Cat", ["Beta", "Gamma"])
+    return assigner
+
+
+def test_valid_rankings_pass():
+    make_assigner().validate_rankings()
+    make_top_k_assigner().validate_rankings()
+    LARPAssigner(3, CHARACTERS).validate_rankings()
+
+
+@pytest.mark.parametrize("ranks", [
+    [1, 1, 3],  # duplicate
+    [1, 2, 4],  # out of range
+    [1, 2, 0],  # incomplete
+    [0, 0, 0],
+    [2, 3, 4],
+])
+def test_dense_rows_written_into_the_storage(ranks):
+    assigner = make_assigner()
+    assigner._ranks[3:6] = type(assigner._ranks)(assigner._ranks.typecode,
+                                                 ranks)
+    with pytest.raises(ValueError, match=(
+            r"Rankings of P1 are not permutations of the character list")):
+        assigner.validate_rankings()
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_every_bad_dense_player_is_named(seed):
+    rng = random.Random(seed)
+    num_players = rng.randint(1, 12)
+    assigner = make_assigner(num_players)
+    bad = sorted(rng.sample(range(num_players), rng.randint(1, num_players)))
+    for row in bad:
+        ranks = rng.choice([[1, 1, 3], [1, 2, 4], [0, 1, 2], [3, 3, 3]])
+        assigner._ranks[3 * row:3 * row + 3] = type(assigner._ranks)(
+            assigner._ranks.typecode, ranks)
+
+    names = ", ".join(f"P{row}" for row in bad[:5])
+    more = f" and {len(bad) - 5} more" if len(bad) > 5 else ""
+    with pytest.raises(ValueError) as error:
+        assigner.validate_rankings()
+    assert str(error.value) == (
+        f"Rankings of {names}{more} are not permutations of the character "
+        f"list"
+    )
+
+
+@pytest.mark.parametrize("position, rank", [
+    (1, 1),  # duplicate: Ann ranks two characters first
+    (1, 3),  # gap: Ann ranks 1 and 3 but not 2
+    (0, 0),  # zero rank stored for a ranked character
+    (1, 65535),  # far out of range
+])
+def test_top_k_ranks_written_into_the_storage(position, rank):
+    assigner = make_top_k_assigner()
+    assigner._sparse_ranks[position] = rank
+    with pytest.raises(ValueError, match=r"Rankings of Ann are not"):
+        assigner.validate_rankings()
+
+
+def test_top_k_rows_with_too_few_or_too_many_ranks():
+    assigner = make_top_k_assigner()
+    # Shift the row boundaries: Ann keeps no entry, and Bob takes three
+    assigner._sparse_indptr[1] = 0
+    assigner._sparse_indptr[2] = 3
+    with pytest.raises(ValueError, match=r"Rankings of Ann, Bob are not"):
+        assigner.validate_rankings()
+
+
+def test_corrupted_file_is_rejected_on_load(tmp_path):
+    path = str(tmp_path / "game.larp")
+    make_assigner(7).save(path)
+    with open(path, "r+b") as f:
+        # Zero the last two players' ranks
+        f.seek(-2 * 2 * len(CHARACTERS), 2)
+        f.write(bytes(2 * 2 * len(CHARACTERS)))
+
+    loaded = LARPAssigner.load(path)
+    with pytest.raises(ValueError, match="Rankings of P5, P6 are not"):
+        loaded.validate_rankings()
+    with pytest.raises(ValueError, match="Rankings of P5, P6 are not"):
+        LARPAssigner.load(path, validate=True)
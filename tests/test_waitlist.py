@@ -0,0 +1,65 @@
+"""Tests for casts with more players than characters and the waitlist."""
+
+import itertools
+import random
+
+import pytest
+
+from solvers import seating_losses
+from tests.helpers import (
+    ENGINES, VALUES, assert_consistent, best_full_casting, random_assigner,
+)
+
+
+def best_with_row_seated(matrix, row):
+    """Best score of a casting filling every column that seats row."""
+    num_rows, num_columns = len(matrix), len(matrix[0])
+    return max(
+        sum(matrix[i][j] for j, i in enumerate(rows))
+        for rows in itertools.permutations(range(num_rows), num_columns)
+        if row in rows
+    )
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_seating_losses_match_brute_force(seed):
+    rng = random.Random(seed)
+    num_columns = rng.randint(1, 4)
+    num_rows = rng.randint(num_columns + 1, 6)
+    matrix = [[rng.choice(VALUES) for _ in range(num_columns)]
+              for _ in range(num_rows)]
+    casting = max(
+        itertools.permutations(range(num_rows), num_columns),
+        key=lambda rows: sum(matrix[i][j] for j, i in enumerate(rows)),
+    )
+    best = sum(matrix[i][j] for j, i in enumerate(casting))
+
+    losses = seating_losses(matrix, list(casting))
+    assert set(losses) == set(range(num_rows)) - set(casting)
+    for row, loss in losses.items():
+        assert loss == pytest.approx(best - best_with_row_seated(matrix, row))
+
+
+@pytest.mark.parametrize("seed", range(100))
+@pytest.mark.parametrize("engine", ENGINES)
+def test_waitlist_orders_the_players_left_over(seed, engine):
+    rng = random.Random(seed)
+    assigner = random_assigner(rng, max_players=7, max_characters=4)
+    scoring_system = rng.choice(["linear", "weighted"])
+
+    assignments, score, details, waitlist = (
+        assigner.solve_assignment_with_waitlist(scoring_system, engine)
+    )
+    assert_consistent(assigner, scoring_system, (assignments, score, details))
+    assert score == pytest.approx(best_full_casting(assigner, scoring_system))
+
+    waiting = [player for player, _ in waitlist]
+    assert sorted(waiting + list(assignments)) == sorted(assigner.players)
+    losses = [loss for _, loss in waitlist]
+    assert losses == sorted(losses)
+
+    _, _, matrix = assigner.generate_assignment_matrix(scoring_system)
+    player_rows = {player: i for i, player in enumerate(assigner.players)}
+    for player, loss in waitlist:
+        seated = best_with_row_seated(matrix.tolist(), player_rows[player])
+        assert loss == pytest.approx(score - seated)